@@ -7,6 +7,7 @@ and API contracts are available without starting a server.
 
 from __future__ import annotations
 
+import json
 import sys
 from pathlib import Path
 
@@ -19,7 +20,8 @@ import main  # noqa: E402
 
 def main_check() -> None:
     dashboard = main.get_dashboard()
-    transactions = main.list_transactions()
+    # List routes return pre-encoded JSON responses.
+    transactions = json.loads(main.list_transactions().body)
     budgets = main.list_budgets()
     goals = main.list_goals()
     rules = main.list_rules()
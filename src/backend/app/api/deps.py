@@ -0,0 +1,53 @@
+"""
+Shared FastAPI dependencies for MoneyFlow Backend.
+"""
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.security import decode_access_token
+from app.models.user import User as UserModel
+from app.schemas.user import User as UserSchema
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/token")
+
+# Snapshots of recently seen users, so authenticated requests skip the user query
+_principal_cache: TTLCache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_SECONDS,
+)
+
+
+def invalidate_principal(user_id: str) -> None:
+    """Drop a cached user snapshot after the underlying row changes."""
+    _principal_cache.discard(user_id)
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> UserSchema:
+    """Resolve the authenticated user from a bearer token.
+
+    A cache miss loads the user on its own short-lived session, so no pooled
+    connection stays checked out for the rest of the request.
+    """
+    credentials_error = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    try:
+        user_id = decode_access_token(token)
+    except ValueError:
+        raise credentials_error
+
+    principal = _principal_cache.get(user_id)
+    if principal is None:
+        async with AsyncSessionLocal() as db:
+            user = await db.get(UserModel, user_id)
+        if not user:
+            raise credentials_error
+        principal = UserSchema.model_validate(user)
+        _principal_cache.set(user_id, principal)
+    return principal
@@ -3,12 +3,18 @@ Main API router that includes all v1 API endpoints.
 """
 
 from fastapi import APIRouter
-from app.api.v1.endpoints import users, transactions, budgets, categories, ai
+from app.api.v1.endpoints import auth, users, transactions, budgets, categories, classification
 
 # Create the main API router
 api_router = APIRouter()
 
 # Include all endpoint routers
+api_router.include_router(
+    auth.router,
+    prefix="/auth",
+    tags=["auth"],
+)
+
 api_router.include_router(
     users.router,
     prefix="/users",
@@ -38,7 +44,7 @@ api_router.include_router(
 )
 
 api_router.include_router(
-    ai.router,
+    classification.router,
     prefix="/ai",
     tags=["ai"],
     responses={404: {"description": "Not found"}},
@@ -4,38 +4,55 @@ Budget management API endpoints.
 
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.api.deps import get_current_user
+from app.core.database import get_async_db
+from app.core.responses import model_response
 from app.models.budget import Budget as BudgetModel
-from app.models.user import User
+from app.schemas.user import User as UserSchema
 from app.schemas.budget import BudgetCreate, BudgetUpdate, Budget as BudgetSchema, BudgetList
 from app.schemas.common import ApiResponse
+from app.services.analysis import invalidate_analysis
+from app.services.ledger import current_period_start, needs_rollover, period_spend, roll_budget_periods
 
 router = APIRouter()
 
 
 @router.get("/", response_model=ApiResponse[BudgetList])
-async def get_budgets(db: Session = Depends(get_db)):
+async def get_budgets(
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Get all budgets for current user."""
     try:
-        # Get current user
-        user = db.query(User).first()
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-
         # Get user's budgets
-        budgets = db.query(BudgetModel).filter(BudgetModel.user_id == user.id).all()
+        result = await db.execute(
+            select(BudgetModel).where(BudgetModel.user_id == current_user.id)
+        )
+        budgets = result.scalars().all()
+
+        # Start a new period for budgets left on an earlier month; this writes
+        # at most once per user per month, otherwise the read stays read-only
+        period = current_period_start()
+        if any(needs_rollover(b, period) for b in budgets):
+            await roll_budget_periods(db, current_user.id, period)
+            await db.commit()
+            invalidate_analysis(current_user.id)
+            result = await db.execute(
+                select(BudgetModel)
+                .where(BudgetModel.user_id == current_user.id)
+                .execution_options(populate_existing=True)
+            )
+            budgets = result.scalars().all()
 
         # Calculate totals
         total_allocated = sum(budget.allocated for budget in budgets)
         total_spent = sum(budget.spent for budget in budgets)
         total_remaining = sum(budget.remaining for budget in budgets)
 
-        return ApiResponse(
+        return model_response(ApiResponse[BudgetList](
             data=BudgetList(
                 budgets=[BudgetSchema.model_validate(b) for b in budgets],
                 total_allocated=total_allocated,
@@ -43,7 +60,7 @@ async def get_budgets(db: Session = Depends(get_db)):
                 total_remaining=total_remaining
             ),
             success=True
-        )
+        ))
 
     except HTTPException:
         raise
@@ -55,29 +72,29 @@ async def get_budgets(db: Session = Depends(get_db)):
 
 
 @router.post("/", response_model=ApiResponse[BudgetSchema])
-async def create_budget(budget: BudgetCreate, db: Session = Depends(get_db)):
+async def create_budget(
+    budget: BudgetCreate,
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Create a new budget."""
     try:
-        # Get current user
-        user = db.query(User).first()
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-
-        # Create budget
+        # Create budget, seeded with this period's spend so far
+        period = current_period_start()
+        spent = await period_spend(db, current_user.id, budget.category, period)
         db_budget = BudgetModel(
             **budget.model_dump(),
-            user_id=user.id,
-            spent=0.0,
-            remaining=budget.allocated,
-            percentage=0.0
+            user_id=current_user.id,
+            period_start=period,
+            spent=spent,
+            remaining=budget.allocated - spent,
+            percentage=(spent / budget.allocated * 100) if budget.allocated > 0 else 0
         )
 
         db.add(db_budget)
-        db.commit()
-        db.refresh(db_budget)
+        await db.commit()
+        await db.refresh(db_budget)
+        invalidate_analysis(current_user.id)
 
         return ApiResponse(
             data=BudgetSchema.model_validate(db_budget),
@@ -86,7 +103,7 @@ async def create_budget(budget: BudgetCreate, db: Session = Depends(get_db)):
         )
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error creating budget: {str(e)}"
@@ -94,10 +111,19 @@ async def create_budget(budget: BudgetCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/{budget_id}", response_model=ApiResponse[BudgetSchema])
-async def get_budget(budget_id: str, db: Session = Depends(get_db)):
+async def get_budget(
+    budget_id: str,
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Get budget by ID."""
     try:
-        budget = db.query(BudgetModel).filter(BudgetModel.id == budget_id).first()
+        budget = await db.scalar(
+            select(BudgetModel).where(
+                BudgetModel.id == budget_id,
+                BudgetModel.user_id == current_user.id
+            )
+        )
         if not budget:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -119,21 +145,21 @@ async def get_budget(budget_id: str, db: Session = Depends(get_db)):
 async def update_budget(
     budget_id: str,
     budget_update: BudgetUpdate,
-    db: Session = Depends(get_db)
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update budget."""
     try:
         # Get existing budget
-        budget = db.query(BudgetModel).filter(BudgetModel.id == budget_id).first()
+        budget = await db.get(BudgetModel, budget_id)
         if not budget:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Budget not found"
             )
 
-        # Get current user to verify ownership
-        user = db.query(User).first()
-        if budget.user_id != user.id:
+        # Verify ownership
+        if budget.user_id != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to update this budget"
@@ -145,12 +171,18 @@ async def update_budget(
             if hasattr(budget, field):
                 setattr(budget, field, value)
 
+        # A budget moved to another category tracks that category's spend
+        if "category" in update_data:
+            budget.period_start = current_period_start()
+            budget.spent = await period_spend(db, current_user.id, budget.category, budget.period_start)
+
         # Recalculate remaining amount
         budget.remaining = budget.allocated - budget.spent
         budget.percentage = (budget.spent / budget.allocated * 100) if budget.allocated > 0 else 0
 
-        db.commit()
-        db.refresh(budget)
+        await db.commit()
+        await db.refresh(budget)
+        invalidate_analysis(current_user.id)
 
         return ApiResponse(
             data=BudgetSchema.model_validate(budget),
@@ -161,7 +193,7 @@ async def update_budget(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error updating budget: {str(e)}"
@@ -169,28 +201,32 @@ async def update_budget(
 
 
 @router.delete("/{budget_id}", response_model=ApiResponse[dict])
-async def delete_budget(budget_id: str, db: Session = Depends(get_db)):
+async def delete_budget(
+    budget_id: str,
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Delete budget."""
     try:
         # Get budget
-        budget = db.query(BudgetModel).filter(BudgetModel.id == budget_id).first()
+        budget = await db.get(BudgetModel, budget_id)
         if not budget:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Budget not found"
             )
 
-        # Get current user to verify ownership
-        user = db.query(User).first()
-        if budget.user_id != user.id:
+        # Verify ownership
+        if budget.user_id != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to delete this budget"
             )
 
         # Delete budget
-        db.delete(budget)
-        db.commit()
+        await db.delete(budget)
+        await db.commit()
+        invalidate_analysis(current_user.id)
 
         return ApiResponse(
             data={"deleted": True},
@@ -201,7 +237,7 @@ async def delete_budget(budget_id: str, db: Session = Depends(get_db)):
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error deleting budget: {str(e)}"
@@ -4,22 +4,25 @@ Category management API endpoints.
 
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.api.deps import get_current_user
+from app.core.database import get_async_db
 from app.models.category import Category as CategoryModel
-from app.models.user import User
 from app.schemas.common import ApiResponse, Category
+from app.schemas.user import User as UserSchema
 
 router = APIRouter()
 
 
 @router.get("/", response_model=ApiResponse[List[Category]])
-async def get_categories(db: Session = Depends(get_db)):
+async def get_categories(db: AsyncSession = Depends(get_async_db)):
     """Get all categories (global categories only)."""
     try:
         # Get global categories (no user_id filter for system categories)
-        categories = db.query(CategoryModel).filter(CategoryModel.user_id.is_(None)).all()
+        result = await db.execute(select(CategoryModel).where(CategoryModel.user_id.is_(None)))
+        categories = result.scalars().all()
 
         return ApiResponse(data=[Category.model_validate(cat) for cat in categories], success=True)
 
@@ -31,25 +34,20 @@ async def get_categories(db: Session = Depends(get_db)):
 
 
 @router.get("/user", response_model=ApiResponse[List[Category]])
-async def get_user_categories(db: Session = Depends(get_db)):
+async def get_user_categories(
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Get categories for current user (including user-specific ones)."""
     try:
-        # Get current user
-        user = db.query(User).first()
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-
         # Get user's categories + global categories
-        user_categories = db.query(CategoryModel).filter(
-            CategoryModel.user_id == user.id
-        ).all()
+        user_categories = (await db.execute(
+            select(CategoryModel).where(CategoryModel.user_id == current_user.id)
+        )).scalars().all()
 
-        global_categories = db.query(CategoryModel).filter(
-            CategoryModel.user_id.is_(None)
-        ).all()
+        global_categories = (await db.execute(
+            select(CategoryModel).where(CategoryModel.user_id.is_(None))
+        )).scalars().all()
 
         # Combine and return all categories
         all_categories = global_categories + user_categories
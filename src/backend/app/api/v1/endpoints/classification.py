@@ -2,74 +2,38 @@
 intelligent analytics and prediction API endpoints.
 """
 
-import random
 from typing import List
-from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-
-from app.core.database import get_db
-from app.models.user import User
-from app.models.transaction import Transaction
-from app.models.budget import Budget
-from app.schemas.ai import (
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.models.job import Job as JobModel
+from app.schemas.classification import (
     automationPrediction, automationAnalysisRequest, automationAnalysisResponse,
     FinancialInsight, BudgetRecommendation
 )
 from app.schemas.common import ApiResponse
+from app.schemas.job import Job, JobStats
+from app.schemas.user import User as UserSchema
+from app.services.analysis import analysis_response, get_analysis
+from app.services.jobs import FINISHED, job_queue
 
 router = APIRouter()
 
 
 @router.get("/predictions", response_model=ApiResponse[automationPrediction])
-async def get_predictions(db: Session = Depends(get_db)):
+async def get_predictions(
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Get intelligent financial predictions."""
     try:
-        # Get current user
-        user = db.query(User).first()
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
+        # Forecast from monthly rollups (shared, cached per-user analysis)
+        analysis = await get_analysis(db, current_user)
 
-        # Get user's transactions and budgets for analysis
-        transactions = db.query(Transaction).filter(
-            Transaction.user_id == user.id
-        ).all()
-
-        budgets = db.query(Budget).filter(
-            Budget.user_id == user.id
-        ).all()
-
-        # Generate mock predictions (in production, use real automation/ML models)
-        prediction = automationPrediction(
-            next_month_spending={
-                "amount": user.monthly_expenses * 1.05,  # 5% increase
-                "confidence": 0.75,
-                "trend": "increasing",
-                "change": user.monthly_expenses * 0.05,
-                "change_percentage": 5.0
-            },
-            budget_forecasts=[
-                {
-                    "category": budget.category,
-                    "predicted": budget.allocated * 1.1,
-                    "current": budget.allocated,
-                    "likelihood": "high" if budget.spent > budget.allocated * 0.8 else "medium",
-                    "confidence": 0.8
-                }
-                for budget in budgets
-            ],
-            savings_projection={
-                "six_months": user.current_savings * 1.15,  # 15% growth
-                "one_year": user.current_savings * 1.32,   # 32% growth
-                "goal_achievement": "on_track" if user.current_savings > user.savings_goal * 0.5 else "needs_improvement",
-                "confidence": 0.7
-            }
-        )
-
-        return ApiResponse(data=prediction, success=True)
+        return ApiResponse(data=analysis.predictions, success=True)
 
     except HTTPException:
         raise
@@ -81,56 +45,15 @@ async def get_predictions(db: Session = Depends(get_db)):
 
 
 @router.get("/insights", response_model=ApiResponse[List[FinancialInsight]])
-async def get_insights(db: Session = Depends(get_db)):
+async def get_insights(
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Get intelligent financial insights."""
     try:
-        # Get current user
-        user = db.query(User).first()
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-
-        # Generate mock insights (in production, use real automation analysis)
-        insights = [
-            FinancialInsight(
-                id="insight_1",
-                type="spending_alert",
-                title="High Dining Expenses",
-                message="You've spent 25% more on dining out this month compared to last month.",
-                severity="warning",
-                category="Food & Dining",
-                actionable=True,
-                suggestions=["Consider cooking at home 2-3 times per week", "Set a weekly dining budget"],
-                potential_savings=150.0,
-                confidence=0.85
-            ),
-            FinancialInsight(
-                id="insight_2",
-                type="savings_opportunity",
-                title="Emergency Fund Growth",
-                message="You're consistently saving 20% of your income. Consider increasing your savings rate to 25%.",
-                severity="info",
-                category="Savings",
-                actionable=True,
-                suggestions=["Increase automatic savings transfer by 5%", "Set up round-up savings"],
-                potential_savings=300.0,
-                confidence=0.9
-            ),
-            FinancialInsight(
-                id="insight_3",
-                type="positive_trend",
-                title="Transportation Savings",
-                message="Great job reducing transportation costs by 15% this month!",
-                severity="success",
-                category="Transportation",
-                actionable=False,
-                confidence=0.95
-            )
-        ]
+        analysis = await get_analysis(db, current_user)
 
-        return ApiResponse(data=insights, success=True)
+        return ApiResponse(data=analysis.insights, success=True)
 
     except HTTPException:
         raise
@@ -142,55 +65,15 @@ async def get_insights(db: Session = Depends(get_db)):
 
 
 @router.get("/recommendations", response_model=ApiResponse[List[BudgetRecommendation]])
-async def get_recommendations(db: Session = Depends(get_db)):
+async def get_recommendations(
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Get intelligent budget recommendations."""
     try:
-        # Get current user
-        user = db.query(User).first()
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-
-        # Get user's budgets
-        budgets = db.query(Budget).filter(Budget.user_id == user.id).all()
-
-        # Generate mock recommendations (in production, use real automation analysis)
-        recommendations = [
-            BudgetRecommendation(
-                category="Food & Dining",
-                current_budget=800.0,
-                recommended_budget=650.0,
-                reasoning="Based on your spending patterns, you consistently spend less than your current budget in this category.",
-                confidence=0.8,
-                impact="medium",
-                effort="low",
-                potential_savings=150.0
-            ),
-            BudgetRecommendation(
-                category="Entertainment",
-                current_budget=300.0,
-                recommended_budget=350.0,
-                reasoning="Your entertainment spending has increased 20% month-over-month. Consider a slight budget increase.",
-                confidence=0.75,
-                impact="low",
-                effort="low",
-                potential_savings=-50.0
-            ),
-            BudgetRecommendation(
-                category="Transportation",
-                current_budget=400.0,
-                recommended_budget=380.0,
-                reasoning="You've been consistently under budget in transportation. A small reduction would be appropriate.",
-                confidence=0.85,
-                impact="low",
-                effort="low",
-                potential_savings=20.0
-            )
-        ]
+        analysis = await get_analysis(db, current_user)
 
-        return ApiResponse(data=recommendations, success=True)
+        return ApiResponse(data=analysis.recommendations, success=True)
 
     except HTTPException:
         raise
@@ -204,108 +87,57 @@ async def get_recommendations(db: Session = Depends(get_db)):
 @router.post("/analyze", response_model=ApiResponse[automationAnalysisResponse])
 async def analyze_finances(
     request: automationAnalysisRequest,
-    db: Session = Depends(get_db)
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Perform comprehensive automation analysis of user's finances."""
     try:
-        # Get current user
-        user = db.query(User).filter(User.id == request.user_id).first()
-        if not user:
+        # Only the authenticated user's finances can be analyzed
+        if request.user_id != current_user.id:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to analyze this user"
             )
 
-        # Get user's financial data
-        transactions = db.query(Transaction).filter(
-            Transaction.user_id == user.id
-        ).all()
-
-        budgets = db.query(Budget).filter(
-            Budget.user_id == user.id
-        ).all()
-
-        # Generate comprehensive analysis (in production, use real automation models)
-        # For now, return the same data as individual endpoints
-        prediction = automationPrediction(
-            next_month_spending={
-                "amount": user.monthly_expenses * 1.05,
-                "confidence": 0.75,
-                "trend": "increasing",
-                "change": user.monthly_expenses * 0.05,
-                "change_percentage": 5.0
-            },
-            budget_forecasts=[
-                {
-                    "category": budget.category,
-                    "predicted": budget.allocated * 1.1,
-                    "current": budget.allocated,
-                    "likelihood": "high" if budget.spent > budget.allocated * 0.8 else "medium",
-                    "confidence": 0.8
-                }
-                for budget in budgets
-            ],
-            savings_projection={
-                "six_months": user.current_savings * 1.15,
-                "one_year": user.current_savings * 1.32,
-                "goal_achievement": "on_track" if user.current_savings > user.savings_goal * 0.5 else "needs_improvement",
-                "confidence": 0.7
-            }
+        # Predictions, insights and recommendations come from the same
+        # shared analysis the individual endpoints serve
+        analysis = await get_analysis(db, current_user)
+
+        return ApiResponse(
+            data=analysis_response(analysis),
+            success=True,
+            message="Financial analysis completed successfully"
         )
 
-        insights = [
-            FinancialInsight(
-                id="insight_1",
-                type="spending_alert",
-                title="High Dining Expenses",
-                message="You've spent 25% more on dining out this month compared to last month.",
-                severity="warning",
-                category="Food & Dining",
-                actionable=True,
-                suggestions=["Consider cooking at home 2-3 times per week", "Set a weekly dining budget"],
-                potential_savings=150.0,
-                confidence=0.85
-            ),
-            FinancialInsight(
-                id="insight_2",
-                type="savings_opportunity",
-                title="Emergency Fund Growth",
-                message="You're consistently saving 20% of your income. Consider increasing your savings rate to 25%.",
-                severity="info",
-                category="Savings",
-                actionable=True,
-                suggestions=["Increase automatic savings transfer by 5%", "Set up round-up savings"],
-                potential_savings=300.0,
-                confidence=0.9
-            )
-        ]
-
-        recommendations = [
-            BudgetRecommendation(
-                category="Food & Dining",
-                current_budget=800.0,
-                recommended_budget=650.0,
-                reasoning="Based on your spending patterns, you consistently spend less than your current budget in this category.",
-                confidence=0.8,
-                impact="medium",
-                effort="low",
-                potential_savings=150.0
-            )
-        ]
-
-        analysis_response = automationAnalysisResponse(
-            predictions=prediction,
-            insights=insights,
-            recommendations=recommendations,
-            summary="Comprehensive financial analysis completed. Focus on dining expenses and consider increasing savings rate.",
-            confidence=0.82,
-            generated_at=datetime.utcnow().isoformat()
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error performing financial analysis: {str(e)}"
         )
 
+
+@router.post("/analyze/jobs", response_model=ApiResponse[Job], status_code=status.HTTP_202_ACCEPTED)
+async def submit_analysis_job(
+    request: automationAnalysisRequest,
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Queue a comprehensive analysis and return the job to poll."""
+    try:
+        if request.user_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to analyze this user"
+            )
+
+        job = await job_queue.submit(db, current_user.id, "analysis", request.model_dump())
+
         return ApiResponse(
-            data=analysis_response,
+            data=Job.model_validate(job),
             success=True,
-            message="Financial analysis completed successfully"
+            message="Financial analysis queued"
         )
 
     except HTTPException:
@@ -313,5 +145,56 @@ async def analyze_finances(
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error performing financial analysis: {str(e)}"
+            detail=f"Error queueing financial analysis: {str(e)}"
+        )
+
+
+@router.get("/jobs/stats", response_model=ApiResponse[JobStats])
+async def get_job_stats(
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get background job queue depth and latency."""
+    try:
+        await job_queue.start()
+        stats = await job_queue.stats(db)
+
+        return ApiResponse(data=stats, success=True)
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching job stats: {str(e)}"
+        )
+
+
+@router.get("/jobs/{job_id}", response_model=ApiResponse[Job])
+async def get_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, description="Seconds to wait for the job to finish (long-poll)"),
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get a background job, optionally waiting for it to finish."""
+    try:
+        await job_queue.start()
+        job = await db.get(JobModel, job_id)
+        if job is None or job.user_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Job not found"
+            )
+
+        if wait and job.status not in FINISHED:
+            await job_queue.wait(job_id, min(wait, settings.JOB_MAX_WAIT_SECONDS))
+            await db.refresh(job)
+
+        return ApiResponse(data=Job.model_validate(job), success=True)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching job: {str(e)}"
         )
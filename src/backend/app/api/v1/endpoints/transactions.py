@@ -2,82 +2,129 @@
 Transaction management API endpoints.
 """
 
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc
+from typing import Annotated, Any, Dict, List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from fastapi.exceptions import RequestValidationError
+from pydantic import Field, TypeAdapter, ValidationError
+from sqlalchemy import and_, or_, desc, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 
-from app.core.database import get_db
-from app.models.transaction import Transaction as TransactionModel
-from app.models.user import User
+from app.api.deps import get_current_user, invalidate_principal
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.responses import model_response
+from app.models.transaction import Transaction as TransactionModel, new_transaction_id
+from app.services.analysis import invalidate_analysis
+from app.services.ledger import record_transaction_change, record_transactions
+from app.services.write_pipeline import transaction_pipeline
 from app.schemas.transaction import (
     TransactionCreate, TransactionUpdate, Transaction as TransactionSchema,
-    TransactionList, TransactionType
+    TransactionList, TransactionType, TransactionBatchResult, TransactionBatchResponse
 )
 from app.schemas.common import ApiResponse, FilterOptions
+from app.schemas.user import User as UserSchema
 
 router = APIRouter()
 
+# Per-user transaction counts keyed by filter set, reused by total_mode="cached"
+_count_cache: TTLCache = TTLCache(maxsize=1024, ttl=settings.TRANSACTION_COUNT_CACHE_SECONDS)
+
+# Batch bodies: a bounded JSON array whose items are validated one by one
+_batch_items: TypeAdapter = TypeAdapter(
+    Annotated[List[Any], Field(max_length=settings.TRANSACTION_BATCH_MAX_ITEMS)]
+)
+
 
 @router.get("/", response_model=ApiResponse[TransactionList])
 async def get_transactions(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    total_mode: Literal["exact", "cached", "none"] = Query("exact"),
     category: Optional[str] = Query(None),
     type_filter: Optional[TransactionType] = Query(None),
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
-    db: Session = Depends(get_db)
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get transactions with optional filtering and pagination."""
-    try:
-        # Get current user (in production, from JWT token)
-        user = db.query(User).first()
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
+    """Get transactions with optional filtering and pagination.
 
+    Passing ``cursor`` switches from offset to keyset pagination on
+    (date, id), so deep pages cost the same as the first one. ``total_mode``
+    controls the total: ``exact`` counts every request, ``cached`` reuses a
+    recent count for the same filters, and ``none`` skips counting.
+    """
+    try:
         # Build query
-        query = db.query(TransactionModel).filter(TransactionModel.user_id == user.id)
+        query = select(TransactionModel).where(TransactionModel.user_id == current_user.id)
 
         # Apply filters
         if category:
-            query = query.filter(TransactionModel.category == category)
+            query = query.where(TransactionModel.category == category)
 
         if type_filter:
-            query = query.filter(TransactionModel.type == type_filter.value)
+            query = query.where(TransactionModel.type == type_filter.value)
 
         if start_date:
-            query = query.filter(TransactionModel.date >= start_date)
+            query = query.where(TransactionModel.date >= start_date)
 
         if end_date:
-            query = query.filter(TransactionModel.date <= end_date)
-
-        # Order by date (newest first)
-        query = query.order_by(desc(TransactionModel.date))
+            query = query.where(TransactionModel.date <= end_date)
 
         # Get total count for pagination
-        total = query.count()
-
-        # Apply pagination
-        transactions = query.offset(skip).limit(limit).all()
-
-        # Calculate total pages
-        total_pages = (total + limit - 1) // limit
+        total = None
+        if total_mode != "none":
+            count_key = (category, type_filter, start_date, end_date)
+            user_counts = _count_cache.get(current_user.id) or {}
+            total = user_counts.get(count_key) if total_mode == "cached" else None
+            if total is None:
+                total = await db.scalar(select(func.count()).select_from(query.subquery()))
+                _count_cache.set(current_user.id, {**user_counts, count_key: total})
+
+        # Seek past the cursor instead of skipping rows
+        if cursor:
+            try:
+                cursor_date, cursor_id = decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid pagination cursor"
+                )
+            query = query.where(
+                or_(
+                    TransactionModel.date < cursor_date,
+                    and_(TransactionModel.date == cursor_date, TransactionModel.id < cursor_id),
+                )
+            )
+        elif skip:
+            query = query.offset(skip)
+
+        # Order by date (newest first), with id as a stable tie-breaker
+        query = query.order_by(desc(TransactionModel.date), desc(TransactionModel.id))
+
+        # Fetch one extra row to learn whether another page exists
+        rows = (await db.execute(query.limit(limit + 1))).scalars().all()
+        transactions = rows[:limit]
+        next_cursor = (
+            encode_cursor(transactions[-1].date, transactions[-1].id)
+            if len(rows) > limit else None
+        )
 
-        return ApiResponse(
+        return model_response(ApiResponse[TransactionList](
             data=TransactionList(
                 transactions=[TransactionSchema.model_validate(t) for t in transactions],
                 total=total,
-                page=(skip // limit) + 1,
+                page=None if cursor else (skip // limit) + 1,
                 limit=limit,
-                total_pages=total_pages
+                total_pages=(total + limit - 1) // limit if total is not None else None,
+                next_cursor=next_cursor
             ),
             success=True
-        )
+        ))
 
     except HTTPException:
         raise
@@ -91,26 +138,19 @@ async def get_transactions(
 @router.get("/recent", response_model=ApiResponse[List[TransactionSchema]])
 async def get_recent_transactions(
     limit: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db)
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get recent transactions."""
     try:
-        # Get current user
-        user = db.query(User).first()
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-
         # Get recent transactions
-        transactions = (
-            db.query(TransactionModel)
-            .filter(TransactionModel.user_id == user.id)
+        result = await db.execute(
+            select(TransactionModel)
+            .where(TransactionModel.user_id == current_user.id)
             .order_by(desc(TransactionModel.date))
             .limit(limit)
-            .all()
         )
+        transactions = result.scalars().all()
 
         return ApiResponse(data=[TransactionSchema.model_validate(t) for t in transactions], success=True)
 
@@ -126,55 +166,144 @@ async def get_recent_transactions(
 @router.post("/", response_model=ApiResponse[TransactionSchema])
 async def create_transaction(
     transaction: TransactionCreate,
-    db: Session = Depends(get_db)
+    current_user: UserSchema = Depends(get_current_user)
 ):
-    """Create a new transaction."""
+    """Create a new transaction.
+
+    The insert, balance and budget updates go through the group-commit
+    pipeline, sharing one commit with concurrent creates.
+    """
     try:
-        # Get current user
-        user = db.query(User).first()
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
+        db_transaction = await transaction_pipeline.submit({
+            **transaction.model_dump(exclude={"date", "type"}),
+            "type": transaction.type.value,
+            "date": transaction.date or datetime.now(),
+            "user_id": current_user.id,
+        })
+        _count_cache.discard(current_user.id)
+        invalidate_principal(current_user.id)
+        invalidate_analysis(current_user.id)
+
+        return ApiResponse(
+            data=TransactionSchema.model_validate(db_transaction),
+            success=True,
+            message="Transaction created successfully"
+        )
 
-        # Create transaction
-        db_transaction = Transaction(
-            **transaction.dict(),
-            user_id=user.id
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error creating transaction: {str(e)}"
         )
 
-        db.add(db_transaction)
-        db.commit()
-        db.refresh(db_transaction)
 
-        # Update user balance
-        if transaction.type == TransactionType.INCOME:
-            user.total_balance += transaction.amount
-        else:
-            user.total_balance -= transaction.amount
+@router.post(
+    "/batch",
+    response_model=ApiResponse[TransactionBatchResponse],
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": {"$ref": "#/components/schemas/TransactionCreate"},
+                        "maxItems": settings.TRANSACTION_BATCH_MAX_ITEMS,
+                    }
+                }
+            },
+        }
+    },
+)
+async def create_transactions_batch(
+    request: Request,
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Create many transactions in one database transaction.
+
+    The body is a JSON array of ``TransactionCreate``. It is read raw (and
+    documented through ``openapi_extra``) so items are validated
+    individually: one malformed row is reported in its result instead of
+    rejecting the whole batch. Valid rows go in with one bulk INSERT, and
+    the net balance and budget change is applied once.
+    """
+    try:
+        items = _batch_items.validate_json(await request.body())
+    except ValidationError as e:
+        # Malformed, non-array and oversized bodies all get FastAPI's 422 shape,
+        # without echoing the (possibly huge) body back
+        raise RequestValidationError([
+            {"type": error["type"], "loc": ("body", *error["loc"]), "msg": error["msg"]}
+            for error in e.errors(include_url=False)
+        ])
 
-        db.commit()
+    try:
+        now = datetime.now()
+        rows: List[Dict[str, Any]] = []
+        results: List[TransactionBatchResult] = []
+        for index, item in enumerate(items):
+            try:
+                transaction = TransactionCreate.model_validate(item)
+            except ValidationError as e:
+                errors = "; ".join(
+                    f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                    for error in e.errors()
+                )
+                results.append(TransactionBatchResult(index=index, success=False, error=errors))
+                continue
+            row = {
+                **transaction.model_dump(exclude={"date", "type"}),
+                "id": new_transaction_id(),
+                "type": transaction.type.value,
+                "date": transaction.date or now,
+                "user_id": current_user.id,
+            }
+            rows.append(row)
+            results.append(TransactionBatchResult(index=index, success=True, id=row["id"]))
+
+        if rows:
+            await db.execute(insert(TransactionModel), rows)
+            await record_transactions(db, [TransactionModel(**row) for row in rows])
+            await db.commit()
+            _count_cache.discard(current_user.id)
+            invalidate_principal(current_user.id)
+            invalidate_analysis(current_user.id)
 
         return ApiResponse(
-            data=db_transaction,
+            data=TransactionBatchResponse(
+                created=len(rows),
+                failed=len(results) - len(rows),
+                results=results
+            ),
             success=True,
-            message="Transaction created successfully"
+            message=f"Created {len(rows)} of {len(items)} transactions"
         )
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error creating transaction: {str(e)}"
+            detail=f"Error creating transactions: {str(e)}"
         )
 
 
 @router.get("/{transaction_id}", response_model=ApiResponse[TransactionSchema])
-async def get_transaction(transaction_id: str, db: Session = Depends(get_db)):
+async def get_transaction(
+    transaction_id: str,
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Get transaction by ID."""
     try:
-        transaction = db.query(TransactionModel).filter(TransactionModel.id == transaction_id).first()
+        transaction = await db.scalar(
+            select(TransactionModel).where(
+                TransactionModel.id == transaction_id,
+                TransactionModel.user_id == current_user.id
+            )
+        )
         if not transaction:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -196,37 +325,54 @@ async def get_transaction(transaction_id: str, db: Session = Depends(get_db)):
 async def update_transaction(
     transaction_id: str,
     transaction_update: TransactionUpdate,
-    db: Session = Depends(get_db)
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update transaction."""
     try:
         # Get existing transaction
-        transaction = db.query(Transaction).filter(Transaction.id == transaction_id).first()
+        transaction = await db.get(TransactionModel, transaction_id)
         if not transaction:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Transaction not found"
             )
 
-        # Get current user to verify ownership
-        user = db.query(User).first()
-        if transaction.user_id != user.id:
+        # Verify ownership
+        if transaction.user_id != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to update this transaction"
             )
 
+        # Keep the old amounts to reverse once the edit is flushed
+        previous = TransactionModel(
+            user_id=transaction.user_id,
+            amount=transaction.amount,
+            category=transaction.category,
+            type=transaction.type,
+            date=transaction.date
+        )
+
         # Update fields
-        update_data = transaction_update.dict(exclude_unset=True)
+        update_data = transaction_update.model_dump(exclude_unset=True)
+        if update_data.get("type") is not None:
+            update_data["type"] = update_data["type"].value
         for field, value in update_data.items():
-            if hasattr(transaction, field):
+            if hasattr(transaction, field) and value is not None:
                 setattr(transaction, field, value)
+        await db.flush()
+
+        await record_transaction_change(db, previous, transaction)
 
-        db.commit()
-        db.refresh(transaction)
+        await db.commit()
+        await db.refresh(transaction)
+        _count_cache.discard(current_user.id)
+        invalidate_principal(current_user.id)
+        invalidate_analysis(current_user.id)
 
         return ApiResponse(
-            data=transaction,
+            data=TransactionSchema.model_validate(transaction),
             success=True,
             message="Transaction updated successfully"
         )
@@ -234,7 +380,7 @@ async def update_transaction(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error updating transaction: {str(e)}"
@@ -242,39 +388,37 @@ async def update_transaction(
 
 
 @router.delete("/{transaction_id}", response_model=ApiResponse[dict])
-async def delete_transaction(transaction_id: str, db: Session = Depends(get_db)):
+async def delete_transaction(
+    transaction_id: str,
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Delete transaction."""
     try:
         # Get transaction
-        transaction = db.query(Transaction).filter(Transaction.id == transaction_id).first()
+        transaction = await db.get(TransactionModel, transaction_id)
         if not transaction:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Transaction not found"
             )
 
-        # Get current user to verify ownership
-        user = db.query(User).first()
-        if transaction.user_id != user.id:
+        # Verify ownership
+        if transaction.user_id != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to delete this transaction"
             )
 
-        # Store amount for balance adjustment
-        amount = transaction.amount
-
-        # Delete transaction
-        db.delete(transaction)
-        db.commit()
-
-        # Update user balance
-        if transaction.type == TransactionType.INCOME:
-            user.total_balance -= amount
-        else:
-            user.total_balance += amount
+        # Delete transaction and reverse its balance and budget effect together
+        await db.delete(transaction)
+        await db.flush()
+        await record_transactions(db, [transaction], sign=-1)
 
-        db.commit()
+        await db.commit()
+        _count_cache.discard(current_user.id)
+        invalidate_principal(current_user.id)
+        invalidate_analysis(current_user.id)
 
         return ApiResponse(
             data={"deleted": True},
@@ -285,7 +429,7 @@ async def delete_transaction(transaction_id: str, db: Session = Depends(get_db))
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error deleting transaction: {str(e)}"
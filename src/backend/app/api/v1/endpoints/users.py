@@ -4,30 +4,24 @@ User management API endpoints.
 
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
-from app.core.database import get_db
+from app.api.deps import get_current_user as current_principal, invalidate_principal
+from app.core.database import get_async_db
 from app.models.user import User as UserModel
 from app.schemas.user import UserCreate, UserUpdate, User as UserSchema, UserProfile
 from app.schemas.common import ApiResponse
+from app.services.analysis import invalidate_analysis
 
 router = APIRouter()
 
 
 @router.get("/me", response_model=ApiResponse[UserSchema])
-async def get_current_user(db: Session = Depends(get_db)):
+async def get_current_user(current_user: UserSchema = Depends(current_principal)):
     """Get current user profile."""
     try:
-        # For now, return the first user (in production, get from JWT token)
-        user = db.query(UserModel).first()
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-
-        return ApiResponse(data=UserSchema.model_validate(user), success=True)
+        return ApiResponse(data=current_user, success=True)
 
     except Exception as e:
         raise HTTPException(
@@ -39,12 +33,12 @@ async def get_current_user(db: Session = Depends(get_db)):
 @router.put("/me", response_model=ApiResponse[UserSchema])
 async def update_current_user(
     user_update: UserUpdate,
-    db: Session = Depends(get_db)
+    current_user: UserSchema = Depends(current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update current user profile."""
     try:
-        # Get current user (in production, get from JWT token)
-        user = db.query(UserModel).first()
+        user = await db.get(UserModel, current_user.id)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -57,8 +51,10 @@ async def update_current_user(
             if hasattr(user, field):
                 setattr(user, field, value)
 
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
+        invalidate_principal(user.id)
+        invalidate_analysis(user.id)
 
         return ApiResponse(
             data=UserSchema.model_validate(user),
@@ -66,14 +62,16 @@ async def update_current_user(
             message="User updated successfully"
         )
 
+    except HTTPException:
+        raise
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already exists"
         )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error updating user: {str(e)}"
@@ -84,12 +82,14 @@ async def update_current_user(
 async def get_users(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    current_user: UserSchema = Depends(current_principal)
 ):
-    """Get all users (admin endpoint)."""
+    """List the users visible to the caller.
+
+    There is no admin role, so a caller only ever sees their own profile.
+    """
     try:
-        users = db.query(UserModel).offset(skip).limit(limit).all()
-        return ApiResponse(data=[UserSchema.model_validate(u) for u in users], success=True)
+        return ApiResponse(data=[current_user][skip:skip + limit], success=True)
 
     except Exception as e:
         raise HTTPException(
@@ -99,17 +99,17 @@ async def get_users(
 
 
 @router.get("/{user_id}", response_model=ApiResponse[UserSchema])
-async def get_user(user_id: str, db: Session = Depends(get_db)):
-    """Get user by ID."""
+async def get_user(user_id: str, current_user: UserSchema = Depends(current_principal)):
+    """Get user by ID; only the caller's own profile is visible."""
     try:
-        user = db.query(UserModel).filter(UserModel.id == user_id).first()
-        if not user:
+        # Other users read as missing, so ids cannot be probed
+        if user_id != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
 
-        return ApiResponse(data=UserSchema.model_validate(user), success=True)
+        return ApiResponse(data=current_user, success=True)
 
     except HTTPException:
         raise
@@ -5,7 +5,7 @@ Uses environment variables with sensible defaults for development.
 """
 
 import secrets
-from typing import List, Optional, Union
+from typing import List, Literal, Optional, Union
 from pydantic import AnyHttpUrl, field_validator
 from pydantic_settings import BaseSettings
 
@@ -27,6 +27,9 @@ class Settings(BaseSettings):
     # Security settings
     SECRET_KEY: str = secrets.token_urlsafe(32)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 days
+    ALGORITHM: str = "HS256"
+    PRINCIPAL_CACHE_SIZE: int = 1024
+    PRINCIPAL_CACHE_SECONDS: int = 60
 
     # CORS settings
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = [
@@ -51,6 +54,39 @@ class Settings(BaseSettings):
     # Database settings
     DATABASE_URL: str = "sqlite:///./moneyflow.db"
     DATABASE_TEST_URL: str = "sqlite:///./test.db"
+    ASYNC_DATABASE_URL: Optional[str] = None  # derived from DATABASE_URL when unset
+
+    # SQLite storage profile: "default" keeps SQLite's own settings,
+    # "throughput" enables WAL with relaxed syncing and memory-mapped reads
+    SQLITE_PROFILE: Literal["default", "throughput"] = "default"
+    SQLITE_POOL_SIZE: int = 8
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_WAL_CHECKPOINT_SECONDS: int = 300
+
+    # Group commit for transaction writes
+    WRITE_BATCH_WINDOW_MS: int = 5
+    WRITE_BATCH_MAX_SIZE: int = 256
+    TRANSACTION_BATCH_MAX_ITEMS: int = 1000
+
+    # Pagination settings
+    TRANSACTION_COUNT_CACHE_SECONDS: int = 30
+
+    # Serialize list responses directly instead of re-validating them
+    FAST_JSON_RESPONSES: bool = True
+
+    # Forecasting
+    FORECAST_HISTORY_MONTHS: int = 24
+    ANALYSIS_WORKERS: int = 4
+    ANALYSIS_CACHE_SIZE: int = 1024
+    ANALYSIS_CACHE_SECONDS: int = 300
+
+    # Background jobs
+    JOB_WORKERS: int = 2
+    JOB_MAX_WAIT_SECONDS: int = 30
+    JOB_LEASE_SECONDS: int = 60
+    JOB_STATS_WINDOW: int = 1000
 
     # automation Service settings (for future integration)
     OPENautomation_API_KEY: Optional[str] = None
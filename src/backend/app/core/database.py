@@ -2,10 +2,12 @@
 Database configuration and connection management for MoneyFlow Backend.
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from typing import Any, AsyncGenerator, Dict, Generator, List, Tuple
+import asyncio
 import os
 
 from app.core.config import settings
@@ -15,16 +17,89 @@ db_path = settings.DATABASE_URL.replace("sqlite:///", "")
 if db_path and os.path.dirname(db_path):
     os.makedirs(os.path.dirname(db_path), exist_ok=True)
 
+is_sqlite = settings.DATABASE_URL.startswith("sqlite")
+is_file_sqlite = is_sqlite and ":memory:" not in settings.DATABASE_URL
+
+
+def sqlite_pragmas(profile: str) -> List[Tuple[str, Any]]:
+    """PRAGMAs applied to every new SQLite connection for a storage profile."""
+    if profile != "throughput":
+        return []
+    return [
+        ("journal_mode", "WAL"),
+        ("synchronous", "NORMAL"),
+        ("busy_timeout", settings.SQLITE_BUSY_TIMEOUT_MS),
+        ("cache_size", -settings.SQLITE_CACHE_SIZE_KB),
+        ("mmap_size", settings.SQLITE_MMAP_SIZE),
+        ("temp_store", "MEMORY"),
+    ]
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Connection event hook that applies the configured storage profile."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in sqlite_pragmas(settings.SQLITE_PROFILE):
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def engine_options() -> Dict[str, Any]:
+    """Pool options shared by the sync and async engines."""
+    if not is_sqlite:
+        return {"pool_pre_ping": True}
+    if not is_file_sqlite:
+        return {}
+    # A local file never drops connections, so skip the pre-ping round trip
+    # and keep a fixed set of connections instead of reopening files
+    return {"pool_size": settings.SQLITE_POOL_SIZE, "max_overflow": 0}
+
+
 # Create SQLAlchemy engine
 engine = create_engine(
     settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {},
-    pool_pre_ping=True,
+    connect_args={"check_same_thread": False} if is_sqlite else {},
+    **engine_options(),
 )
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def async_database_url(url: str) -> str:
+    """Map a sync database URL onto its asyncio driver.
+
+    Only SQLite and PostgreSQL are supported: the rollup upserts rely on
+    INSERT ... ON CONFLICT.
+    """
+    for sync_prefix, async_prefix in (
+        ("sqlite:", "sqlite+aiosqlite:"),
+        ("postgresql:", "postgresql+asyncpg:"),
+    ):
+        if url.startswith(sync_prefix):
+            return async_prefix + url[len(sync_prefix):]
+    return url
+
+
+# Async engine used by the request handlers; the sync engine above stays
+# for table creation, migrations and seeding
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL),
+    **engine_options(),
+)
+
+if is_sqlite:
+    event.listen(engine, "connect", apply_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # Create Base class for models
 Base = declarative_base()
 
@@ -38,6 +113,34 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency to get an async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def checkpoint_wal(mode: str = "PASSIVE") -> Tuple[int, int, int]:
+    """Fold the SQLite write-ahead log back into the database file.
+
+    Returns SQLite's (busy, log frames, checkpointed frames) triple.
+    """
+    with engine.connect() as connection:
+        row = connection.exec_driver_sql(f"PRAGMA wal_checkpoint({mode})").one()
+    return tuple(row)
+
+
+async def run_wal_checkpoints(interval: float = settings.SQLITE_WAL_CHECKPOINT_SECONDS) -> None:
+    """Checkpoint the WAL periodically; started as a task by the app lifespan."""
+    if not is_file_sqlite or settings.SQLITE_PROFILE != "throughput":
+        return
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(checkpoint_wal)
+        except Exception as e:
+            print(f"[ERROR] WAL checkpoint failed: {e}")
+
+
 async def create_tables():
     """Create all database tables."""
     try:
@@ -46,11 +149,17 @@ async def create_tables():
         from app.models.transaction import Transaction
         from app.models.budget import Budget
         from app.models.category import Category
+        from app.models.rollup import MonthlyRollup
+        from app.models.job import Job
 
         # Create all tables
         Base.metadata.create_all(bind=engine)
         print("[SUCCESS] Database tables created successfully")
 
+        # Bring existing databases up to the current schema version
+        from app.db.migrations import run_migrations
+        run_migrations(engine)
+
     except Exception as e:
         print(f"[ERROR] Error creating database tables: {e}")
         raise
@@ -96,11 +205,14 @@ def init_db():
         for cat in categories_data:
             db.add(cat)
 
-        # Create sample user
+        # Create sample user (development password: "moneyflow-demo")
+        from app.core.security import hash_password
+
         sample_user = User(
             id="user_1",
             name="Alex Thompson",
             email="alex.thompson@example.com",
+            hashed_password=hash_password("moneyflow-demo"),
             total_balance=15420.75,
             monthly_income=5500.00,
             monthly_expenses=3200.00,
@@ -183,6 +295,14 @@ def init_db():
 
         for trans in transactions_data:
             db.add(trans)
+        db.flush()
+
+        # Derive budget spend and monthly rollups from the sample transactions
+        from app.services.ledger import current_period_start, rebuild_budget_spend
+        from app.services.rollups import rebuild_statements
+        db.execute(rebuild_budget_spend(current_period_start()))
+        for statement in rebuild_statements(engine.dialect.name):
+            db.execute(statement)
 
         db.commit()
         print("[SUCCESS] Database initialized with sample data")
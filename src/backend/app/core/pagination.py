@@ -0,0 +1,27 @@
+"""
+Keyset pagination helpers for MoneyFlow Backend.
+
+Cursors are opaque, URL-safe tokens that encode the sort key of the last row
+served, so the next page is a range seek instead of an OFFSET scan.
+"""
+
+import base64
+import binascii
+from datetime import datetime
+from typing import Tuple
+
+
+def encode_cursor(date: datetime, row_id: str) -> str:
+    """Encode a (date, id) sort key as an opaque cursor."""
+    raw = f"{date.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decode a cursor produced by encode_cursor, raising ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        date_text, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(date_text), row_id
+    except (ValueError, UnicodeDecodeError, binascii.Error):
+        raise ValueError("Invalid pagination cursor")
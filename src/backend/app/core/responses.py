@@ -0,0 +1,24 @@
+"""
+Response helpers for MoneyFlow Backend.
+"""
+
+from typing import Union
+
+from fastapi import Response, status
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+
+def model_response(model: BaseModel, status_code: int = status.HTTP_200_OK) -> Union[Response, BaseModel]:
+    """Serialize an already-validated response model straight to JSON.
+
+    Returning a ``Response`` skips FastAPI's response_model pass (a second
+    validation, ``jsonable_encoder`` and ``json.dumps``); pydantic-core
+    writes the bytes in one call. The route's ``response_model`` still
+    documents the schema. With ``FAST_JSON_RESPONSES`` off the model is
+    returned unchanged and FastAPI serializes it as before.
+    """
+    if not settings.FAST_JSON_RESPONSES:
+        return model
+    return Response(content=model.model_dump_json(), media_type="application/json", status_code=status_code)
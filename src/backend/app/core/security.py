@@ -0,0 +1,48 @@
+"""
+Token signing and password hashing for MoneyFlow Backend.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from jose import JWTError, jwt
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+
+
+def hash_password(password: str) -> str:
+    """Hash a plain-text password for storage."""
+    return pwd_context.hash(password)
+
+
+def verify_password(password: str, hashed_password: Optional[str]) -> bool:
+    """Check a plain-text password against a stored hash."""
+    if not hashed_password:
+        return False
+    return pwd_context.verify(password, hashed_password)
+
+
+def create_access_token(subject: str, expires_delta: Optional[timedelta] = None) -> str:
+    """Sign an access token whose subject is the user id."""
+    expire = datetime.now(timezone.utc) + (
+        expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    return jwt.encode({"sub": subject, "exp": expire}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def decode_access_token(token: str) -> str:
+    """Verify a token's signature and expiry and return its subject.
+
+    Raises ValueError if the token is invalid, expired or has no subject.
+    """
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError as e:
+        raise ValueError(str(e))
+    subject = payload.get("sub")
+    if not subject:
+        raise ValueError("Token has no subject")
+    return subject
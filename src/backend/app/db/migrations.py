@@ -0,0 +1,159 @@
+"""
+Versioned schema migrations for MoneyFlow Backend.
+
+``Base.metadata.create_all`` only creates missing tables; it never adds
+indexes or columns to tables that already exist. Each migration below runs
+once, in version order, inside its own transaction and is recorded in the
+``schema_migrations`` table, so existing databases are brought up to date on
+startup. Run ``python -m app.db.migrations`` to upgrade a database by hand.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, List
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+
+@dataclass(frozen=True)
+class Migration:
+    """A single schema change applied at most once per database."""
+    version: int
+    description: str
+    upgrade: Callable[[Connection], None]
+
+
+def sql(*statements: str) -> Callable[[Connection], None]:
+    """Build an upgrade step that executes raw SQL statements in order."""
+    def upgrade(connection: Connection) -> None:
+        for statement in statements:
+            connection.execute(text(statement))
+    return upgrade
+
+
+def add_column(table: str, column: str, ddl: str) -> Callable[[Connection], None]:
+    """Build an upgrade step that adds a column unless create_all already did."""
+    def upgrade(connection: Connection) -> None:
+        existing = {c["name"] for c in inspect(connection).get_columns(table)}
+        if column not in existing:
+            connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+    return upgrade
+
+
+def backfill_budget_periods(connection: Connection) -> None:
+    """Add budgets.period_start and recompute spend for the current period."""
+    from app.services.ledger import current_period_start, rebuild_budget_spend
+
+    add_column("budgets", "period_start", "DATETIME")(connection)
+    connection.execute(rebuild_budget_spend(current_period_start()))
+
+
+def backfill_monthly_rollups(connection: Connection) -> None:
+    """Create monthly_rollups if needed and fill it from transactions."""
+    from app.models.rollup import MonthlyRollup
+    from app.services.rollups import rebuild_statements
+
+    MonthlyRollup.__table__.create(connection, checkfirst=True)
+    for statement in rebuild_statements(connection.dialect.name):
+        connection.execute(statement)
+
+
+def create_jobs_table(connection: Connection) -> None:
+    """Create the background job table and its status index."""
+    from app.models.job import Job
+
+    Job.__table__.create(connection, checkfirst=True)
+
+
+def add_job_leases(connection: Connection) -> None:
+    """Add the lease owner and heartbeat columns to jobs."""
+    add_column("jobs", "owner", "VARCHAR")(connection)
+    add_column("jobs", "heartbeat_at", "DATETIME")(connection)
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(
+        version=1,
+        description="Composite indexes for per-user listing and analytics",
+        upgrade=sql(
+            "CREATE INDEX IF NOT EXISTS ix_transactions_user_date "
+            "ON transactions (user_id, date DESC, id DESC)",
+            "CREATE INDEX IF NOT EXISTS ix_transactions_user_category_date "
+            "ON transactions (user_id, category, date)",
+            "CREATE INDEX IF NOT EXISTS ix_transactions_user_type_date "
+            "ON transactions (user_id, type, date)",
+            "CREATE INDEX IF NOT EXISTS ix_budgets_user_category "
+            "ON budgets (user_id, category)",
+            # Refresh planner statistics so the new indexes are chosen
+            "ANALYZE",
+        ),
+    ),
+    Migration(
+        version=2,
+        description="Password hashes for token authentication",
+        upgrade=add_column("users", "hashed_password", "VARCHAR"),
+    ),
+    Migration(
+        version=3,
+        description="Materialized budget spend per period",
+        upgrade=backfill_budget_periods,
+    ),
+    Migration(
+        version=4,
+        description="Monthly transaction rollups",
+        upgrade=backfill_monthly_rollups,
+    ),
+    Migration(
+        version=5,
+        description="Persistent background jobs",
+        upgrade=create_jobs_table,
+    ),
+    Migration(
+        version=6,
+        description="Leases for running background jobs",
+        upgrade=add_job_leases,
+    ),
+]
+
+
+def ensure_migrations_table(connection: Connection) -> None:
+    """Create the bookkeeping table that records applied versions."""
+    connection.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        "version INTEGER PRIMARY KEY, "
+        "description VARCHAR NOT NULL, "
+        "applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+    ))
+
+
+def applied_versions(connection: Connection) -> List[int]:
+    """Return the versions already applied to this database."""
+    rows = connection.execute(text("SELECT version FROM schema_migrations ORDER BY version"))
+    return [row[0] for row in rows]
+
+
+def run_migrations(engine: Engine) -> List[int]:
+    """Apply every pending migration in order and return the versions applied."""
+    with engine.begin() as connection:
+        ensure_migrations_table(connection)
+        done = set(applied_versions(connection))
+
+    applied = []
+    for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+        if migration.version in done:
+            continue
+        with engine.begin() as connection:
+            migration.upgrade(connection)
+            connection.execute(
+                text("INSERT INTO schema_migrations (version, description) VALUES (:version, :description)"),
+                {"version": migration.version, "description": migration.description},
+            )
+        print(f"[SUCCESS] Applied migration {migration.version}: {migration.description}")
+        applied.append(migration.version)
+    return applied
+
+
+if __name__ == "__main__":
+    from app.core.database import engine
+
+    run_migrations(engine)
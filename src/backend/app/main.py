@@ -0,0 +1,54 @@
+"""
+FastAPI application for MoneyFlow Backend.
+
+Run with ``uvicorn app.main:app`` from ``src/backend``.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+
+from app.api.v1.api import api_router
+from app.core.config import settings
+from app.core.database import create_tables, run_wal_checkpoints
+from app.services.jobs import job_queue
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Create tables on startup and run background work until shutdown."""
+    await create_tables()
+    tasks: List[asyncio.Task] = [
+        # Returns immediately unless the SQLite throughput profile is on
+        asyncio.create_task(run_wal_checkpoints()),
+    ]
+    # Resume queued and expired jobs and keep the lease sweep running
+    await job_queue.start()
+    try:
+        yield
+    finally:
+        await job_queue.close()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+app = FastAPI(
+    title=settings.PROJECT_NAME,
+    description=settings.DESCRIPTION,
+    version=settings.VERSION,
+    lifespan=lifespan,
+)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=[str(origin).rstrip("/") for origin in settings.BACKEND_CORS_ORIGINS],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+app.include_router(api_router, prefix=settings.API_V1_STR)
@@ -2,7 +2,9 @@
 SQLAlchemy models for Budget data.
 """
 
-from sqlalchemy import Column, String, Float, DateTime, ForeignKey, func
+from uuid import uuid4
+
+from sqlalchemy import Column, String, Float, DateTime, ForeignKey, Index, func
 from sqlalchemy.ext.declarative import declarative_base
 from app.core.database import Base
 
@@ -12,14 +14,18 @@ class Budget(Base):
 
     __tablename__ = "budgets"
 
-    id = Column(String, primary_key=True, index=True)
+    id = Column(String, primary_key=True, index=True, default=lambda: f"budget_{uuid4().hex}")
     category = Column(String, nullable=False)
     allocated = Column(Float, nullable=False)
     spent = Column(Float, default=0.0)
     remaining = Column(Float, default=0.0)
     percentage = Column(Float, default=0.0)
+    period_start = Column(DateTime(timezone=True), nullable=True)  # month spent/remaining cover
     color = Column(String, default="#3B82F6")
     icon = Column(String, default="💰")
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+Index("ix_budgets_user_category", Budget.user_id, Budget.category)
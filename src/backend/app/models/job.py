@@ -0,0 +1,30 @@
+"""
+SQLAlchemy models for background jobs.
+"""
+
+from uuid import uuid4
+
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Index, JSON, func
+from app.core.database import Base
+
+
+class Job(Base):
+    """Background job persisted so queued work survives restarts."""
+
+    __tablename__ = "jobs"
+
+    id = Column(String, primary_key=True, index=True, default=lambda: f"job_{uuid4().hex}")
+    kind = Column(String, nullable=False)  # e.g. 'analysis'
+    status = Column(String, nullable=False, default="queued")  # queued, running, succeeded, failed
+    payload = Column(JSON, nullable=True)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    owner = Column(String, nullable=True)  # queue holding the lease while running
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+
+Index("ix_jobs_status_created", Job.status, Job.created_at)
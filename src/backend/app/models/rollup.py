@@ -0,0 +1,21 @@
+"""
+SQLAlchemy models for monthly transaction rollups.
+"""
+
+from sqlalchemy import Column, String, Float, Integer, DateTime, ForeignKey
+from app.core.database import Base
+
+
+class MonthlyRollup(Base):
+    """Per-user totals for one (month, category, type) bucket of transactions."""
+
+    __tablename__ = "monthly_rollups"
+
+    user_id = Column(String, ForeignKey("users.id"), primary_key=True)
+    month = Column(DateTime(timezone=True), primary_key=True)  # first instant of the month
+    category = Column(String, primary_key=True)
+    type = Column(String, primary_key=True)  # 'income' or 'expense'
+    total = Column(Float, nullable=False, default=0.0)
+    count = Column(Integer, nullable=False, default=0)
+    min_amount = Column(Float, nullable=True)
+    max_amount = Column(Float, nullable=True)
@@ -2,17 +2,24 @@
 SQLAlchemy models for Transaction data.
 """
 
-from sqlalchemy import Column, String, Float, DateTime, Text, Enum, ForeignKey, func
+from uuid import uuid4
+
+from sqlalchemy import Column, String, Float, DateTime, Text, Enum, ForeignKey, Index, func
 from sqlalchemy.ext.declarative import declarative_base
 from app.core.database import Base
 
 
+def new_transaction_id() -> str:
+    """Generate a primary key for a new transaction."""
+    return f"trans_{uuid4().hex}"
+
+
 class Transaction(Base):
     """Transaction model for storing financial transactions."""
 
     __tablename__ = "transactions"
 
-    id = Column(String, primary_key=True, index=True)
+    id = Column(String, primary_key=True, index=True, default=new_transaction_id)
     amount = Column(Float, nullable=False)
     category = Column(String, nullable=False)
     subcategory = Column(String, nullable=True)
@@ -25,3 +32,11 @@ class Transaction(Base):
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+# Composite indexes backing per-user listing (keyset on date, id) and the
+# category/type filtered analytics; existing databases get them from
+# app.db.migrations.
+Index("ix_transactions_user_date", Transaction.user_id, Transaction.date.desc(), Transaction.id.desc())
+Index("ix_transactions_user_category_date", Transaction.user_id, Transaction.category, Transaction.date)
+Index("ix_transactions_user_type_date", Transaction.user_id, Transaction.type, Transaction.date)
@@ -15,6 +15,7 @@ class User(Base):
     id = Column(String, primary_key=True, index=True)
     name = Column(String, nullable=False)
     email = Column(String, unique=True, index=True, nullable=False)
+    hashed_password = Column(String, nullable=True)
     total_balance = Column(Float, default=0.0)
     monthly_income = Column(Float, default=0.0)
     monthly_expenses = Column(Float, default=0.0)
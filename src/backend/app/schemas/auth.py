@@ -0,0 +1,12 @@
+"""
+Pydantic schemas for authentication.
+"""
+
+from pydantic import BaseModel
+
+
+class Token(BaseModel):
+    """Schema for an issued access token."""
+    access_token: str
+    token_type: str = "bearer"
+    expires_in: int
@@ -13,6 +13,8 @@ class SpendingForecast(BaseModel):
     trend: str
     change: float
     change_percentage: float
+    lower: Optional[float] = None  # 95% interval, None until there is enough history
+    upper: Optional[float] = None
 
 
 class BudgetForecast(BaseModel):
@@ -22,6 +24,8 @@ class BudgetForecast(BaseModel):
     current: float
     likelihood: str
     confidence: float
+    lower: Optional[float] = None
+    upper: Optional[float] = None
 
 
 class SavingsProjection(BaseModel):
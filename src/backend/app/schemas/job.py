@@ -0,0 +1,36 @@
+"""
+Pydantic schemas for background jobs.
+"""
+
+from typing import Any, Dict, Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class Job(BaseModel):
+    """Schema for a background job and, once finished, its result."""
+    id: str
+    kind: str
+    status: str
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        """Pydantic configuration."""
+        from_attributes = True
+
+
+class JobStats(BaseModel):
+    """Schema for job queue depth and latency."""
+    workers: int
+    queued: int
+    running: int
+    succeeded: int
+    failed: int
+    avg_wait_seconds: Optional[float] = None
+    p95_wait_seconds: Optional[float] = None
+    avg_run_seconds: Optional[float] = None
+    p95_run_seconds: Optional[float] = None
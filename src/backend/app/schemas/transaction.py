@@ -2,7 +2,7 @@
 Pydantic schemas for Transaction-related operations.
 """
 
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from pydantic import BaseModel
 from enum import Enum
@@ -63,7 +63,23 @@ class Transaction(TransactionInDBBase):
 class TransactionList(BaseModel):
     """Schema for paginated transaction list."""
     transactions: list[Transaction]
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     limit: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+
+class TransactionBatchResult(BaseModel):
+    """Outcome for one item of a batch create."""
+    index: int
+    success: bool
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class TransactionBatchResponse(BaseModel):
+    """Schema for a batch create summary."""
+    created: int
+    failed: int
+    results: List[TransactionBatchResult]
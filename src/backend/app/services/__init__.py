@@ -0,0 +1,3 @@
+"""
+Domain services package for MoneyFlow Backend.
+"""
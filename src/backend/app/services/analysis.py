@@ -0,0 +1,217 @@
+"""
+Financial analysis service for MoneyFlow Backend.
+
+The /ai endpoints share one per-user analysis. Its inputs (budgets and
+monthly rollups) are loaded once, then predictions, insights and
+recommendations are computed concurrently on a worker pool so the event
+loop stays free. Background analysis jobs get a pool of their own so long
+runs cannot starve the interactive endpoints. Results are cached per user until that user's
+transactions, budgets or profile change. Concurrent requests for the same
+user wait on a single in-flight computation instead of starting their own.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.budget import Budget
+from app.models.job import Job
+from app.models.user import User
+from app.schemas.budget import Budget as BudgetSchema
+from app.schemas.classification import (
+    automationPrediction, automationAnalysisResponse, BudgetRecommendation, FinancialInsight
+)
+from app.schemas.user import User as UserSchema
+from app.services.forecasting import MonthlyHistory, build_prediction, monthly_history
+
+
+@dataclass(frozen=True)
+class AnalysisResult:
+    """Everything the /ai endpoints serve for one user."""
+    predictions: automationPrediction
+    insights: List[FinancialInsight]
+    recommendations: List[BudgetRecommendation]
+
+
+_executor = ThreadPoolExecutor(max_workers=settings.ANALYSIS_WORKERS, thread_name_prefix="analysis")
+_job_executor = ThreadPoolExecutor(max_workers=settings.JOB_WORKERS, thread_name_prefix="analysis-job")
+_cache: TTLCache = TTLCache(maxsize=settings.ANALYSIS_CACHE_SIZE, ttl=settings.ANALYSIS_CACHE_SECONDS)
+_versions: Dict[str, int] = {}
+_inflight: Dict[Tuple[str, int], asyncio.Future] = {}
+
+
+def invalidate_analysis(user_id: str) -> None:
+    """Mark a user's analysis stale; call after committing a change to their data."""
+    _versions[user_id] = _versions.get(user_id, 0) + 1
+    _cache.discard(user_id)
+
+
+def build_insights(
+    user: UserSchema,
+    budgets: Sequence[BudgetSchema],
+    history: MonthlyHistory
+) -> List[FinancialInsight]:
+    """Generate financial insights (static until a real model is wired in)."""
+    return [
+        FinancialInsight(
+            id="insight_1",
+            type="spending_alert",
+            title="High Dining Expenses",
+            message="You've spent 25% more on dining out this month compared to last month.",
+            severity="warning",
+            category="Food & Dining",
+            actionable=True,
+            suggestions=["Consider cooking at home 2-3 times per week", "Set a weekly dining budget"],
+            potential_savings=150.0,
+            confidence=0.85
+        ),
+        FinancialInsight(
+            id="insight_2",
+            type="savings_opportunity",
+            title="Emergency Fund Growth",
+            message="You're consistently saving 20% of your income. Consider increasing your savings rate to 25%.",
+            severity="info",
+            category="Savings",
+            actionable=True,
+            suggestions=["Increase automatic savings transfer by 5%", "Set up round-up savings"],
+            potential_savings=300.0,
+            confidence=0.9
+        ),
+        FinancialInsight(
+            id="insight_3",
+            type="positive_trend",
+            title="Transportation Savings",
+            message="Great job reducing transportation costs by 15% this month!",
+            severity="success",
+            category="Transportation",
+            actionable=False,
+            confidence=0.95
+        )
+    ]
+
+
+def build_recommendations(
+    user: UserSchema,
+    budgets: Sequence[BudgetSchema],
+    history: MonthlyHistory
+) -> List[BudgetRecommendation]:
+    """Generate budget recommendations (static until a real model is wired in)."""
+    return [
+        BudgetRecommendation(
+            category="Food & Dining",
+            current_budget=800.0,
+            recommended_budget=650.0,
+            reasoning="Based on your spending patterns, you consistently spend less than your current budget in this category.",
+            confidence=0.8,
+            impact="medium",
+            effort="low",
+            potential_savings=150.0
+        ),
+        BudgetRecommendation(
+            category="Entertainment",
+            current_budget=300.0,
+            recommended_budget=350.0,
+            reasoning="Your entertainment spending has increased 20% month-over-month. Consider a slight budget increase.",
+            confidence=0.75,
+            impact="low",
+            effort="low",
+            potential_savings=-50.0
+        ),
+        BudgetRecommendation(
+            category="Transportation",
+            current_budget=400.0,
+            recommended_budget=380.0,
+            reasoning="You've been consistently under budget in transportation. A small reduction would be appropriate.",
+            confidence=0.85,
+            impact="low",
+            effort="low",
+            potential_savings=20.0
+        )
+    ]
+
+
+async def compute_analysis(
+    db: AsyncSession,
+    user: UserSchema,
+    executor: Optional[ThreadPoolExecutor] = None
+) -> AnalysisResult:
+    """Load the user's inputs once, then run the three analyses side by side."""
+    executor = executor or _executor
+    budgets = [
+        BudgetSchema.model_validate(budget)
+        for budget in (await db.execute(select(Budget).where(Budget.user_id == user.id))).scalars()
+    ]
+    history = await monthly_history(db, user.id)
+
+    loop = asyncio.get_running_loop()
+    predictions, insights, recommendations = await asyncio.gather(
+        loop.run_in_executor(executor, build_prediction, user, budgets, history),
+        loop.run_in_executor(executor, build_insights, user, budgets, history),
+        loop.run_in_executor(executor, build_recommendations, user, budgets, history),
+    )
+    return AnalysisResult(predictions=predictions, insights=insights, recommendations=recommendations)
+
+
+async def get_analysis(
+    db: AsyncSession,
+    user: UserSchema,
+    executor: Optional[ThreadPoolExecutor] = None
+) -> AnalysisResult:
+    """Return the user's analysis from cache, a shared in-flight run, or a fresh run."""
+    version = _versions.get(user.id, 0)
+    cached = _cache.get(user.id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    key = (user.id, version)
+    inflight = _inflight.get(key)
+    if inflight is not None:
+        return await asyncio.shield(inflight)
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        result = await compute_analysis(db, user, executor)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # mark retrieved when no one else was waiting
+        raise
+    finally:
+        _inflight.pop(key, None)
+
+    # A change committed while computing bumps the version; don't cache stale work
+    if _versions.get(user.id, 0) == version:
+        _cache.set(user.id, (version, result))
+    future.set_result(result)
+    return result
+
+
+def analysis_response(analysis: AnalysisResult) -> automationAnalysisResponse:
+    """Wrap a user's analysis in the comprehensive /ai/analyze response."""
+    return automationAnalysisResponse(
+        predictions=analysis.predictions,
+        insights=analysis.insights,
+        recommendations=analysis.recommendations,
+        summary="Comprehensive financial analysis completed. Focus on dining expenses and consider increasing savings rate.",
+        confidence=0.82,
+        generated_at=datetime.utcnow().isoformat()
+    )
+
+
+async def run_analysis_job(db: AsyncSession, job: Job) -> Dict[str, Any]:
+    """Job handler: run a comprehensive analysis on the background pool."""
+    user = await db.get(User, job.user_id)
+    if user is None:
+        raise ValueError("User not found")
+    analysis = await get_analysis(db, UserSchema.model_validate(user), executor=_job_executor)
+    return analysis_response(analysis).model_dump(mode="json")
@@ -0,0 +1,231 @@
+"""
+Spending forecasts for MoneyFlow Backend.
+
+Forecasts read ``monthly_rollups`` (one row per category and month), never
+raw transactions, and fit every series with a single least-squares solve:
+an intercept and linear trend, plus annual Fourier terms once enough
+history exists to estimate a season. Intervals come from the residual
+variance and the design's leverage at the forecast month.
+"""
+
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.rollup import MonthlyRollup
+from app.schemas.budget import Budget as BudgetSchema
+from app.schemas.classification import automationPrediction
+from app.schemas.user import User as UserSchema
+from app.services.rollups import month_start
+
+Z_95 = 1.96
+TREND_MIN_MONTHS = 3
+SEASONAL_MIN_MONTHS = 18
+
+# (expense categories, expenses[category, month], income[month])
+MonthlyHistory = Tuple[List[str], np.ndarray, np.ndarray]
+
+
+@dataclass
+class SeriesForecast:
+    """Point forecasts and 95% intervals, one entry per input series."""
+    mean: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    stderr: np.ndarray  # NaN when history is too short to estimate spread
+    last: np.ndarray  # most recent observed value
+
+
+def month_number(value: datetime) -> int:
+    """Months since year 0, so consecutive months differ by one."""
+    return value.year * 12 + value.month - 1
+
+
+def design_matrix(t: np.ndarray, trend: bool, seasonal: bool) -> np.ndarray:
+    """Regressors for months t: intercept, optional trend, optional annual harmonics."""
+    columns = [np.ones_like(t, dtype=float)]
+    if trend:
+        columns.append(t.astype(float))
+    if seasonal:
+        angle = 2 * np.pi * t / 12
+        columns.extend([np.sin(angle), np.cos(angle)])
+    return np.column_stack(columns)
+
+
+def fit_series(history: np.ndarray, steps_ahead: int = 1) -> SeriesForecast:
+    """Forecast each row of history (series x months) steps_ahead months past its end."""
+    k, n = history.shape
+    if n == 0:
+        zeros = np.zeros(k)
+        nan = np.full(k, np.nan)
+        return SeriesForecast(mean=zeros, lower=nan, upper=nan, stderr=nan, last=zeros)
+
+    t = np.arange(n)
+    trend = n >= TREND_MIN_MONTHS
+    seasonal = n >= SEASONAL_MIN_MONTHS
+    X = design_matrix(t, trend, seasonal)
+    beta, *_ = np.linalg.lstsq(X, history.T, rcond=None)
+
+    dof = n - X.shape[1]
+    if dof > 0:
+        residuals = history.T - X @ beta
+        sigma2 = (residuals ** 2).sum(axis=0) / dof
+    else:
+        sigma2 = np.full(k, np.nan)
+
+    x_next = design_matrix(np.array([n - 1 + steps_ahead]), trend, seasonal)
+    leverage = (x_next @ np.linalg.pinv(X.T @ X) @ x_next.T).item()
+    stderr = np.sqrt(sigma2 * (1 + leverage))
+
+    mean = np.clip((x_next @ beta)[0], 0, None)
+    return SeriesForecast(
+        mean=mean,
+        lower=np.clip(mean - Z_95 * stderr, 0, None),
+        upper=mean + Z_95 * stderr,
+        stderr=stderr,
+        last=history[:, -1],
+    )
+
+
+def interval_confidence(mean: float, stderr: float) -> float:
+    """Map an interval's relative width onto a 0-1 confidence score."""
+    if math.isnan(stderr):
+        return 0.5
+    return round(min(max(1 - Z_95 * stderr / max(mean, 1.0), 0.05), 0.99), 2)
+
+
+def exceed_probability(mean: float, stderr: float, limit: float) -> float:
+    """Probability that a normally distributed outcome exceeds limit."""
+    if math.isnan(stderr) or stderr == 0:
+        return 1.0 if mean > limit else 0.0
+    return 0.5 * math.erfc((limit - mean) / (stderr * math.sqrt(2)))
+
+
+def optional(value: float) -> Optional[float]:
+    """Round a forecast figure, mapping NaN (unknown) to None."""
+    return None if math.isnan(value) else round(float(value), 2)
+
+
+async def monthly_history(
+    db: AsyncSession,
+    user_id: str,
+    months: int = settings.FORECAST_HISTORY_MONTHS
+) -> MonthlyHistory:
+    """Load complete months of rollups as (categories, expenses[k, n], income[n]).
+
+    History starts at the user's first month with activity inside the
+    window and ends with the last complete month; months without
+    transactions count as zero.
+    """
+    current = month_number(month_start(datetime.now()))
+    window_start = current - months
+    rows = (await db.execute(
+        select(MonthlyRollup.month, MonthlyRollup.category, MonthlyRollup.type, MonthlyRollup.total)
+        .where(
+            MonthlyRollup.user_id == user_id,
+            MonthlyRollup.month >= datetime(window_start // 12, window_start % 12 + 1, 1),
+            MonthlyRollup.month < month_start(datetime.now()),
+        )
+    )).all()
+    if not rows:
+        return [], np.zeros((0, 0)), np.zeros(0)
+
+    first = min(month_number(row.month) for row in rows)
+    n = current - first
+    categories = sorted({row.category for row in rows if row.type == "expense"})
+    position: Dict[str, int] = {category: i for i, category in enumerate(categories)}
+    expenses = np.zeros((len(categories), n))
+    income = np.zeros(n)
+    for row in rows:
+        column = month_number(row.month) - first
+        if row.type == "expense":
+            expenses[position[row.category], column] += row.total
+        else:
+            income[column] += row.total
+    return categories, expenses, income
+
+
+def likelihood(probability: float) -> str:
+    """Bucket an overspend probability for display."""
+    if probability >= 0.66:
+        return "high"
+    if probability >= 0.33:
+        return "medium"
+    return "low"
+
+
+def build_prediction(
+    user: UserSchema,
+    budgets: Sequence[BudgetSchema],
+    history: MonthlyHistory
+) -> automationPrediction:
+    """Forecast next month's spending, per-budget spend and savings from monthly history.
+
+    Pure CPU work, safe to run in a worker thread.
+    """
+    categories, expenses, income = history
+
+    # One solve covers every category, total spending and total income; the
+    # history ends last month, so next month is two steps ahead
+    series = np.vstack([expenses, expenses.sum(axis=0, keepdims=True), income[None, :]])
+    forecast = fit_series(series, steps_ahead=2)
+    spend_i, income_i = len(categories), len(categories) + 1
+
+    if income.shape[0]:
+        spend_mean = float(forecast.mean[spend_i])
+        spend_last = float(forecast.last[spend_i])
+    else:
+        # No history yet: fall back on the profile's stated monthly expenses
+        spend_mean = spend_last = user.monthly_expenses
+    spend_stderr = float(forecast.stderr[spend_i])
+    change = spend_mean - spend_last
+    change_percentage = (change / spend_last * 100) if spend_last else 0.0
+
+    position = {category: i for i, category in enumerate(categories)}
+    budget_forecasts = []
+    for budget in budgets:
+        i = position.get(budget.category)
+        mean = float(forecast.mean[i]) if i is not None else 0.0
+        stderr = float(forecast.stderr[i]) if i is not None else float("nan")
+        budget_forecasts.append({
+            "category": budget.category,
+            "predicted": round(mean, 2),
+            "current": budget.allocated,
+            "likelihood": likelihood(exceed_probability(mean, stderr, budget.allocated)),
+            "confidence": interval_confidence(mean, stderr),
+            "lower": optional(forecast.lower[i]) if i is not None else None,
+            "upper": optional(forecast.upper[i]) if i is not None else None,
+        })
+
+    if income.shape[0]:
+        net = float(forecast.mean[income_i]) - spend_mean
+        net_stderr = math.hypot(float(forecast.stderr[income_i]), spend_stderr)
+    else:
+        net = user.monthly_income - user.monthly_expenses
+        net_stderr = float("nan")
+    one_year = user.current_savings + 12 * net
+
+    return automationPrediction(
+        next_month_spending={
+            "amount": round(spend_mean, 2),
+            "confidence": interval_confidence(spend_mean, spend_stderr),
+            "trend": "increasing" if change_percentage > 2 else "decreasing" if change_percentage < -2 else "stable",
+            "change": round(change, 2),
+            "change_percentage": round(change_percentage, 1),
+            "lower": optional(forecast.lower[spend_i]),
+            "upper": optional(forecast.upper[spend_i]),
+        },
+        budget_forecasts=budget_forecasts,
+        savings_projection={
+            "six_months": round(user.current_savings + 6 * net, 2),
+            "one_year": round(one_year, 2),
+            "goal_achievement": "on_track" if one_year >= user.savings_goal else "needs_improvement",
+            "confidence": interval_confidence(abs(net), net_stderr),
+        }
+    )
@@ -0,0 +1,244 @@
+"""
+Background job queue for MoneyFlow Backend.
+
+Long-running work is recorded in the ``jobs`` table and executed by a fixed
+number of in-process workers, so an HTTP request only has to insert a row
+and return its id. Clients poll (or long-poll) the job for its result. The
+table is the source of truth, shared by every worker process: a running job
+is leased to the queue that claimed it, which refreshes ``heartbeat_at``
+while it works. Queued jobs, and running jobs whose heartbeat is older than
+the lease, are picked up by any queue on start and on every lease sweep, so
+work left by a crashed process resumes without a live job running twice.
+"""
+
+import asyncio
+import os
+import socket
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+from uuid import uuid4
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.job import Job
+from app.schemas.job import JobStats
+from app.services.analysis import run_analysis_job
+
+JobHandler = Callable[[AsyncSession, Job], Awaitable[Dict[str, Any]]]
+
+FINISHED = ("succeeded", "failed")
+
+
+def p95(samples: Deque[float]) -> Optional[float]:
+    """95th percentile of the recorded samples, or None if there are none."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[int(0.95 * (len(ordered) - 1))], 4)
+
+
+def mean(samples: Deque[float]) -> Optional[float]:
+    """Average of the recorded samples, or None if there are none."""
+    if not samples:
+        return None
+    return round(sum(samples) / len(samples), 4)
+
+
+class JobQueue:
+    """Run persisted jobs on a bounded pool of event-loop workers."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        workers: int = settings.JOB_WORKERS,
+        stats_window: int = settings.JOB_STATS_WINDOW,
+        lease: float = settings.JOB_LEASE_SECONDS
+    ):
+        self.session_factory = session_factory
+        self.workers = workers
+        self.lease = lease
+        self.owner: Optional[str] = None
+        self.handlers: Dict[str, JobHandler] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._enqueued_at: Dict[str, float] = {}
+        self._finished: Dict[str, asyncio.Event] = {}
+        self._wait_samples: Deque[float] = deque(maxlen=stats_window)
+        self._run_samples: Deque[float] = deque(maxlen=stats_window)
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        """Route jobs of ``kind`` to ``handler``, which returns the job result."""
+        self.handlers[kind] = handler
+
+    async def start(self) -> None:
+        """Start the workers for this event loop and re-queue unfinished jobs."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._tasks and not all(task.done() for task in self._tasks):
+            return
+        # Queues and tasks belong to one event loop, so (re)start per loop
+        # under a fresh owner token; leases held by an earlier loop expire
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._enqueued_at.clear()
+        self._finished.clear()
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._tasks = [loop.create_task(self._run()) for _ in range(self.workers)]
+        self._tasks.append(loop.create_task(self._sweep()))
+        await self._recover()
+
+    async def close(self) -> None:
+        """Stop the workers; unfinished jobs stay queued in the table."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, db: AsyncSession, user_id: str, kind: str, payload: Dict[str, Any]) -> Job:
+        """Persist a new job and queue it; returns without waiting for the work."""
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        await self.start()
+        job = Job(kind=kind, status="queued", payload=payload, user_id=user_id)
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+        self._enqueue(job.id)
+        return job
+
+    async def wait(self, job_id: str, timeout: float) -> None:
+        """Block until the job finishes or ``timeout`` seconds pass."""
+        finished = self._finished.get(job_id)
+        if finished is None:
+            # Not queued in this process: already finished, or unknown
+            return
+        try:
+            await asyncio.wait_for(finished.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def stats(self, db: AsyncSession) -> JobStats:
+        """Queue depth by status plus recent wait and run latencies."""
+        rows = await db.execute(select(Job.status, func.count()).group_by(Job.status))
+        counts = {status: count for status, count in rows}
+        return JobStats(
+            workers=self.workers,
+            queued=counts.get("queued", 0),
+            running=counts.get("running", 0),
+            succeeded=counts.get("succeeded", 0),
+            failed=counts.get("failed", 0),
+            avg_wait_seconds=mean(self._wait_samples),
+            p95_wait_seconds=p95(self._wait_samples),
+            avg_run_seconds=mean(self._run_samples),
+            p95_run_seconds=p95(self._run_samples)
+        )
+
+    def _enqueue(self, job_id: str) -> None:
+        if job_id in self._finished:
+            return
+        self._enqueued_at[job_id] = self._loop.time()
+        self._finished[job_id] = asyncio.Event()
+        self._queue.put_nowait(job_id)
+
+    async def _sweep(self) -> None:
+        while True:
+            await asyncio.sleep(self.lease)
+            try:
+                await self._recover()
+            except Exception as e:
+                print(f"[ERROR] Job lease sweep failed: {e}")
+
+    async def _recover(self) -> None:
+        expired = datetime.utcnow() - timedelta(seconds=self.lease)
+        async with self.session_factory() as db:
+            # Only reclaim running jobs whose owner stopped heartbeating
+            await db.execute(
+                update(Job)
+                .where(
+                    Job.status == "running",
+                    or_(Job.heartbeat_at.is_(None), Job.heartbeat_at < expired)
+                )
+                .values(status="queued", started_at=None, owner=None, heartbeat_at=None)
+            )
+            job_ids = (await db.execute(
+                select(Job.id).where(Job.status == "queued").order_by(Job.created_at)
+            )).scalars().all()
+            await db.commit()
+        for job_id in job_ids:
+            self._enqueue(job_id)
+
+    async def _run(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._execute(job_id)
+            except Exception as e:
+                print(f"[ERROR] Job {job_id} could not be recorded: {e}")
+            finally:
+                self._enqueued_at.pop(job_id, None)
+                finished = self._finished.pop(job_id, None)
+                if finished is not None:
+                    finished.set()
+                self._queue.task_done()
+
+    async def _execute(self, job_id: str) -> None:
+        loop = asyncio.get_running_loop()
+        async with self.session_factory() as db:
+            # Claim atomically so a job queued twice only runs once
+            claimed = await db.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == "queued")
+                .values(status="running", started_at=func.now(), owner=self.owner, heartbeat_at=datetime.utcnow())
+            )
+            await db.commit()
+            if claimed.rowcount == 0:
+                return
+
+            started = loop.time()
+            self._wait_samples.append(started - self._enqueued_at.get(job_id, started))
+            owner = self.owner
+            heartbeat = loop.create_task(self._heartbeat(job_id, owner))
+            job = await db.get(Job, job_id)
+            handler = self.handlers.get(job.kind)
+            try:
+                if handler is None:
+                    raise ValueError(f"Unknown job kind: {job.kind}")
+                result = await handler(db, job)
+                values = {"status": "succeeded", "result": result, "error": None}
+            except Exception as e:
+                await db.rollback()
+                values = {"status": "failed", "result": None, "error": str(e)}
+            finally:
+                heartbeat.cancel()
+            self._run_samples.append(loop.time() - started)
+
+            # A lease lost meanwhile means another queue owns the job now
+            await db.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.owner == owner)
+                .values(finished_at=func.now(), heartbeat_at=None, **values)
+            )
+            await db.commit()
+
+    async def _heartbeat(self, job_id: str, owner: str) -> None:
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            try:
+                async with self.session_factory() as db:
+                    await db.execute(
+                        update(Job)
+                        .where(Job.id == job_id, Job.owner == owner)
+                        .values(heartbeat_at=datetime.utcnow())
+                    )
+                    await db.commit()
+            except Exception as e:
+                print(f"[ERROR] Job {job_id} heartbeat failed: {e}")
+
+
+# Shared queue used by the /ai job endpoints
+job_queue = JobQueue()
+job_queue.register("analysis", run_analysis_job)
@@ -0,0 +1,218 @@
+"""
+Budget ledger for MoneyFlow Backend.
+
+Budgets carry materialized ``spent``, ``remaining`` and ``percentage`` for
+their current period. The transaction write path keeps them current with
+relative UPDATE statements in the caller's database transaction, so budget
+reads never re-sum transactions.
+"""
+
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import case, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Update
+
+from app.models.budget import Budget
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.services.rollups import add_to_rollups, month_start, next_month_start, remove_from_rollups
+
+
+def period_start(value: datetime) -> datetime:
+    """Return the first instant of the budget period (calendar month) containing value."""
+    return month_start(value)
+
+
+def next_period_start(start: datetime) -> datetime:
+    """Return the start of the period following start."""
+    return next_month_start(start)
+
+
+def current_period_start() -> datetime:
+    """Return the start of the budget period in progress."""
+    return period_start(datetime.now())
+
+
+def local_naive(value: datetime) -> datetime:
+    """Return a database datetime as naive local time, like ``datetime.now()``.
+
+    Timezone-aware columns come back aware on PostgreSQL and naive on SQLite.
+    """
+    return value.astimezone().replace(tzinfo=None) if value.tzinfo else value
+
+
+def needs_rollover(budget: Budget, period: datetime) -> bool:
+    """Whether a budget is still on a period before ``period``."""
+    return budget.period_start is None or local_naive(budget.period_start) < period
+
+
+def spend_amount(transaction_type: str, amount: float) -> float:
+    """Return how much a transaction counts toward budget spend."""
+    return amount if transaction_type == "expense" else 0.0
+
+
+def balance_amount(transaction_type: str, amount: float) -> float:
+    """Return a transaction's signed effect on the user's balance."""
+    return amount if transaction_type == "income" else -amount
+
+
+def spend_values(spent):
+    """SET clause that keeps remaining and percentage in step with spent."""
+    return {
+        "spent": spent,
+        "remaining": Budget.allocated - spent,
+        "percentage": case((Budget.allocated > 0, spent * 100.0 / Budget.allocated), else_=0.0),
+    }
+
+
+async def roll_budget_periods(db: AsyncSession, user_id: str, period: Optional[datetime] = None) -> int:
+    """Start a fresh period for budgets still on an earlier one; returns rows rolled.
+
+    The new period starts from the expenses already recorded in it, so rows
+    dated ahead of the rollover (or flushed in the caller's transaction) count.
+    """
+    period = period or current_period_start()
+    result = await db.execute(
+        update(Budget)
+        .where(
+            Budget.user_id == user_id,
+            or_(Budget.period_start.is_(None), Budget.period_start < period),
+        )
+        .values(period_start=period, **spend_values(period_spend_subquery(period)))
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+async def apply_balance_delta(db: AsyncSession, user_id: str, delta: float) -> None:
+    """Move a user's balance with a relative UPDATE so concurrent writers never lose updates."""
+    if not delta:
+        return
+    await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(total_balance=User.total_balance + delta)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def apply_spend_totals(db: AsyncSession, totals: Dict[Tuple[str, str], float]) -> None:
+    """Add current-period spend per (user_id, category) to the matching budgets.
+
+    Deltas only move budgets already on the current period. Budgets rolled
+    over afterwards are seeded from the flushed transactions, which include
+    this change, so nothing is counted twice.
+    """
+    period = current_period_start()
+    for (user_id, category), delta in totals.items():
+        if not delta:
+            continue
+        await db.execute(
+            update(Budget)
+            .where(
+                Budget.user_id == user_id,
+                Budget.category == category,
+                Budget.period_start == period,
+            )
+            .values(**spend_values(Budget.spent + delta))
+            .execution_options(synchronize_session=False)
+        )
+    for user_id in {user_id for user_id, _ in totals}:
+        await roll_budget_periods(db, user_id, period)
+
+
+async def apply_balances_and_spend(db: AsyncSession, transactions: Iterable[Transaction], sign: int = 1) -> None:
+    """Apply (sign=1) or reverse (sign=-1) the balance and budget effect of transactions."""
+    await apply_signed_effects(db, [(transaction, sign) for transaction in transactions])
+
+
+async def apply_signed_effects(db: AsyncSession, changes: Iterable[Tuple[Transaction, int]]) -> None:
+    """Apply the balance and budget effect of each transaction times its sign.
+
+    Effects are netted per user and per budget first, so a batch costs one
+    UPDATE per touched row rather than one per transaction. Only expenses
+    dated in the current period move a budget.
+    """
+    current = current_period_start()
+    balances: Dict[str, float] = defaultdict(float)
+    spend: Dict[Tuple[str, str], float] = defaultdict(float)
+    for transaction, sign in changes:
+        balances[transaction.user_id] += sign * balance_amount(transaction.type, transaction.amount)
+        if period_start(transaction.date) == current:
+            spend[(transaction.user_id, transaction.category)] += (
+                sign * spend_amount(transaction.type, transaction.amount)
+            )
+
+    for user_id, delta in balances.items():
+        await apply_balance_delta(db, user_id, delta)
+    if any(spend.values()):
+        await apply_spend_totals(db, spend)
+
+
+async def record_transactions(db: AsyncSession, transactions: Iterable[Transaction], sign: int = 1) -> None:
+    """Apply (sign=1) or reverse (sign=-1) the balance, budget and rollup effect of transactions.
+
+    When reversing, the deletes must already be flushed. The caller commits.
+    """
+    transactions = list(transactions)
+    await apply_balances_and_spend(db, transactions, sign)
+    if sign > 0:
+        await add_to_rollups(db, transactions)
+    else:
+        await remove_from_rollups(db, transactions)
+
+
+async def record_transaction_change(db: AsyncSession, previous: Transaction, current: Transaction) -> None:
+    """Move an edited transaction's effects from its old values to its new ones.
+
+    The edit must already be flushed; the caller commits.
+    """
+    # One netted pass, so a rollover it triggers is not followed by a second delta
+    await apply_signed_effects(db, [(previous, -1), (current, 1)])
+    recomputed = await remove_from_rollups(db, [previous])
+    await add_to_rollups(db, [current], skip=recomputed)
+
+
+async def period_spend(db: AsyncSession, user_id: str, category: str, period: datetime) -> float:
+    """Sum one category's expenses for a period, e.g. when a budget is created."""
+    total = await db.scalar(
+        select(func.coalesce(func.sum(Transaction.amount), 0.0)).where(
+            Transaction.user_id == user_id,
+            Transaction.category == category,
+            Transaction.type == "expense",
+            Transaction.date >= period,
+            Transaction.date < next_period_start(period),
+        )
+    )
+    return float(total or 0.0)
+
+
+def period_spend_subquery(period: datetime):
+    """Correlated subquery summing the updated budget's expenses for period."""
+    return (
+        select(func.coalesce(func.sum(Transaction.amount), 0.0))
+        .where(
+            Transaction.user_id == Budget.user_id,
+            Transaction.category == Budget.category,
+            Transaction.type == "expense",
+            Transaction.date >= period,
+            Transaction.date < next_period_start(period),
+        )
+        .scalar_subquery()
+    )
+
+
+def rebuild_budget_spend(period: datetime) -> Update:
+    """Statement that recomputes every budget's spend for period from transactions.
+
+    Used to backfill and to repair drift; it works on sync and async
+    connections alike.
+    """
+    return (
+        update(Budget)
+        .values(period_start=period, **spend_values(period_spend_subquery(period)))
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,235 @@
+"""
+Monthly transaction rollups for MoneyFlow Backend.
+
+``monthly_rollups`` holds sum, count, min and max per (user, month,
+category, type). The ledger keeps it current as transactions are written:
+inserts fold into their bucket with one upsert, and removals decrement it
+unless they take away the bucket's min or max, in which case only that
+bucket is recomputed from its transactions. Analytics read these rows
+instead of scanning transactions.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AbstractSet, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, case, delete, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Executable
+
+from app.models.rollup import MonthlyRollup
+from app.models.transaction import Transaction
+
+Bucket = Tuple[str, datetime, str, str]  # (user_id, month, category, type)
+
+
+@dataclass
+class BucketDelta:
+    """Aggregate of the transactions entering or leaving one bucket."""
+    total: float = 0.0
+    count: int = 0
+    min_amount: Optional[float] = None
+    max_amount: Optional[float] = None
+
+    def add(self, amount: float) -> None:
+        self.total += amount
+        self.count += 1
+        self.min_amount = amount if self.min_amount is None else min(self.min_amount, amount)
+        self.max_amount = amount if self.max_amount is None else max(self.max_amount, amount)
+
+
+def month_start(value: datetime) -> datetime:
+    """Return the first instant of the month containing value."""
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+
+
+def next_month_start(start: datetime) -> datetime:
+    """Return the start of the month following start."""
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+
+def bucket_deltas(transactions: Iterable[Transaction]) -> Dict[Bucket, BucketDelta]:
+    """Group transactions by rollup bucket."""
+    deltas: Dict[Bucket, BucketDelta] = {}
+    for transaction in transactions:
+        key = (transaction.user_id, month_start(transaction.date), transaction.category, transaction.type)
+        deltas.setdefault(key, BucketDelta()).add(transaction.amount)
+    return deltas
+
+
+def dialect_insert(dialect_name: str):
+    """Return the INSERT construct that supports ON CONFLICT for a dialect."""
+    if dialect_name == "postgresql":
+        return postgresql_insert
+    if dialect_name == "sqlite":
+        return sqlite_insert
+    raise NotImplementedError(f"Rollups need ON CONFLICT support; only sqlite and postgresql are supported, not {dialect_name}")
+
+
+def bucket_filter(key: Bucket):
+    """WHERE clause selecting one rollup row."""
+    user_id, month, category, transaction_type = key
+    return and_(
+        MonthlyRollup.user_id == user_id,
+        MonthlyRollup.month == month,
+        MonthlyRollup.category == category,
+        MonthlyRollup.type == transaction_type,
+    )
+
+
+def upsert_buckets(dialect_name: str, deltas: Dict[Bucket, BucketDelta], replace: bool = False) -> Executable:
+    """One multi-row upsert that folds deltas into (or, with replace, overwrites) their buckets."""
+    stmt = dialect_insert(dialect_name)(MonthlyRollup).values([
+        {
+            "user_id": user_id,
+            "month": month,
+            "category": category,
+            "type": transaction_type,
+            "total": delta.total,
+            "count": delta.count,
+            "min_amount": delta.min_amount,
+            "max_amount": delta.max_amount,
+        }
+        for (user_id, month, category, transaction_type), delta in deltas.items()
+    ])
+    excluded = stmt.excluded
+    if replace:
+        values = {
+            "total": excluded.total,
+            "count": excluded.count,
+            "min_amount": excluded.min_amount,
+            "max_amount": excluded.max_amount,
+        }
+    else:
+        values = {
+            "total": MonthlyRollup.total + excluded.total,
+            "count": MonthlyRollup.count + excluded.count,
+            "min_amount": case(
+                (MonthlyRollup.min_amount <= excluded.min_amount, MonthlyRollup.min_amount),
+                else_=excluded.min_amount,
+            ),
+            "max_amount": case(
+                (MonthlyRollup.max_amount >= excluded.max_amount, MonthlyRollup.max_amount),
+                else_=excluded.max_amount,
+            ),
+        }
+    return stmt.on_conflict_do_update(
+        index_elements=[MonthlyRollup.user_id, MonthlyRollup.month, MonthlyRollup.category, MonthlyRollup.type],
+        set_=values,
+    )
+
+
+async def add_to_rollups(
+    db: AsyncSession,
+    transactions: Iterable[Transaction],
+    skip: AbstractSet[Bucket] = frozenset()
+) -> None:
+    """Fold newly written transactions into their buckets; the caller commits.
+
+    Buckets in skip were just recomputed from the database and already
+    include these rows.
+    """
+    deltas = {key: delta for key, delta in bucket_deltas(transactions).items() if key not in skip}
+    if deltas:
+        await db.execute(upsert_buckets(db.get_bind().dialect.name, deltas))
+
+
+async def remove_from_rollups(db: AsyncSession, transactions: Iterable[Transaction]) -> Set[Bucket]:
+    """Take removed transactions out of their buckets; the caller commits.
+
+    The rows must already be gone from (or changed in) the database, e.g.
+    flushed, because a bucket that loses its min or max is recomputed.
+    Returns the buckets that were recomputed.
+    """
+    dialect_name = db.get_bind().dialect.name
+    recomputed: Set[Bucket] = set()
+    for key, delta in bucket_deltas(transactions).items():
+        current = (await db.execute(
+            select(MonthlyRollup.count, MonthlyRollup.min_amount, MonthlyRollup.max_amount)
+            .where(bucket_filter(key))
+        )).first()
+        if (
+            current is None
+            or current.count - delta.count <= 0
+            or delta.min_amount <= current.min_amount
+            or delta.max_amount >= current.max_amount
+        ):
+            await recompute_bucket(db, dialect_name, key)
+            recomputed.add(key)
+            continue
+        await db.execute(
+            update(MonthlyRollup)
+            .where(bucket_filter(key))
+            .values(total=MonthlyRollup.total - delta.total, count=MonthlyRollup.count - delta.count)
+            .execution_options(synchronize_session=False)
+        )
+    return recomputed
+
+
+async def recompute_bucket(db: AsyncSession, dialect_name: str, key: Bucket) -> None:
+    """Rebuild one bucket from its transactions, dropping it when empty."""
+    user_id, month, category, transaction_type = key
+    row = (await db.execute(
+        select(
+            func.coalesce(func.sum(Transaction.amount), 0.0),
+            func.count(Transaction.id),
+            func.min(Transaction.amount),
+            func.max(Transaction.amount),
+        ).where(
+            Transaction.user_id == user_id,
+            Transaction.category == category,
+            Transaction.type == transaction_type,
+            Transaction.date >= month,
+            Transaction.date < next_month_start(month),
+        )
+    )).one()
+    total, count, min_amount, max_amount = row
+    if not count:
+        await db.execute(
+            delete(MonthlyRollup).where(bucket_filter(key)).execution_options(synchronize_session=False)
+        )
+        return
+    await db.execute(upsert_buckets(
+        dialect_name,
+        {key: BucketDelta(total=total, count=count, min_amount=min_amount, max_amount=max_amount)},
+        replace=True,
+    ))
+
+
+def month_expression(dialect_name: str):
+    """SQL expression truncating transactions.date to its month bucket."""
+    if dialect_name == "postgresql":
+        return func.date_trunc("month", Transaction.date)
+    # SQLite stores datetimes as text in SQLAlchemy's "%Y-%m-%d %H:%M:%S.%f" format
+    return func.strftime("%Y-%m-01 00:00:00.000000", Transaction.date)
+
+
+def rebuild_statements(dialect_name: str, user_id: Optional[str] = None) -> List[Executable]:
+    """Statements that rebuild rollups from scratch, for every user or just one.
+
+    Migrations and seeding run them on a sync connection.
+    """
+    month = month_expression(dialect_name)
+    source = select(
+        Transaction.user_id,
+        month,
+        Transaction.category,
+        Transaction.type,
+        func.sum(Transaction.amount),
+        func.count(Transaction.id),
+        func.min(Transaction.amount),
+        func.max(Transaction.amount),
+    ).group_by(Transaction.user_id, month, Transaction.category, Transaction.type)
+    clear = delete(MonthlyRollup)
+    if user_id is not None:
+        source = source.where(Transaction.user_id == user_id)
+        clear = clear.where(MonthlyRollup.user_id == user_id)
+    fill = insert(MonthlyRollup).from_select(
+        ["user_id", "month", "category", "type", "total", "count", "min_amount", "max_amount"],
+        source,
+    )
+    return [clear.execution_options(synchronize_session=False), fill]
@@ -0,0 +1,120 @@
+"""
+Group-commit write pipeline for MoneyFlow Backend.
+
+Concurrent transaction creates are queued and committed together: the
+first request opens a short window, every request arriving within it joins
+the same database transaction, and one commit (one fsync) covers them all.
+Each caller awaits its own future and gets its own row or error back.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.transaction import Transaction
+from app.services.ledger import record_transactions
+
+
+@dataclass
+class PendingWrite:
+    """One queued create and the future its caller is waiting on."""
+    values: Dict[str, Any]
+    future: asyncio.Future = field(repr=False)
+
+
+class TransactionWritePipeline:
+    """Coalesce concurrent transaction inserts into shared commits."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        window: float = settings.WRITE_BATCH_WINDOW_MS / 1000,
+        max_batch: int = settings.WRITE_BATCH_MAX_SIZE
+    ):
+        self.session_factory = session_factory
+        self.window = window
+        self.max_batch = max_batch
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def submit(self, values: Dict[str, Any]) -> Transaction:
+        """Queue one transaction insert and wait until its batch commits."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            # Queues and tasks belong to one event loop, so (re)start per loop
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+        pending = PendingWrite(values=values, future=loop.create_future())
+        await self._queue.put(pending)
+        return await pending.future
+
+    async def close(self) -> None:
+        """Stop the worker once already queued writes are committed."""
+        if self._worker is None:
+            return
+        await self._queue.join()
+        self._worker.cancel()
+        self._worker = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._commit(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _commit(self, batch: List[PendingWrite]) -> None:
+        try:
+            async with self.session_factory() as db:
+                rows = await self._write(db, batch)
+                await db.commit()
+        except Exception:
+            # One bad row must not fail its neighbours: retry each on its own
+            await self._commit_individually(batch)
+            return
+        for pending, row in zip(batch, rows):
+            if not pending.future.done():
+                pending.future.set_result(row)
+
+    async def _commit_individually(self, batch: List[PendingWrite]) -> None:
+        for pending in batch:
+            try:
+                async with self.session_factory() as db:
+                    row, = await self._write(db, [pending])
+                    await db.commit()
+            except Exception as e:
+                if not pending.future.done():
+                    pending.future.set_exception(e)
+            else:
+                if not pending.future.done():
+                    pending.future.set_result(row)
+
+    @staticmethod
+    async def _write(db: AsyncSession, batch: List[PendingWrite]) -> List[Transaction]:
+        rows = [Transaction(**pending.values) for pending in batch]
+        db.add_all(rows)
+        await db.flush()
+        await record_transactions(db, rows)
+        return rows
+
+
+# Shared pipeline used by the transaction endpoints
+transaction_pipeline = TransactionWritePipeline()
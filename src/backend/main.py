@@ -9,16 +9,30 @@ SQLAlchemy or PostgreSQL without changing the frontend integration surface.
 
 from __future__ import annotations
 
-from collections import defaultdict
+import binascii
+import calendar
+import csv
+import io
+import json
+import re
+import threading
+import zlib
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from bisect import bisect_left
+from collections import OrderedDict, deque
 from datetime import date as Date, datetime, timedelta
 from enum import Enum
-from statistics import mean
-from typing import Literal
+from functools import lru_cache, wraps
+from itertools import islice
+from statistics import mean, median
+from typing import Annotated, BinaryIO, Callable, Iterable, Iterator, Literal, TypeVar
 from uuid import uuid4
 
-from fastapi import FastAPI, HTTPException, Query
+import numpy as np
+from fastapi import FastAPI, File, HTTPException, Query, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, Field, ValidationError, model_validator
 
 
 class TransactionType(str, Enum):
@@ -51,6 +65,31 @@ class TransactionCreate(BaseModel):
     recurring: bool = False
 
 
+class TransactionPage(BaseModel):
+    items: list[Transaction]
+    next_cursor: str | None = None
+    limit: int
+
+
+class TransactionUpdate(BaseModel):
+    date: Date | None = None
+    merchant: str | None = Field(default=None, min_length=2)
+    category: str | None = Field(default=None, min_length=2)
+    amount: float | None = Field(default=None, gt=0)
+    type: TransactionType | None = None
+    account: str | None = None
+    note: str | None = None
+    recurring: bool | None = None
+
+    @model_validator(mode="after")
+    def reject_nulls(self) -> TransactionUpdate:
+        # Fields are optional so they can be omitted; only note may be cleared with null.
+        nulled = sorted(name for name in self.model_fields_set if name != "note" and getattr(self, name) is None)
+        if nulled:
+            raise ValueError(f"{', '.join(nulled)} cannot be null")
+        return self
+
+
 class Budget(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid4()))
     category: str
@@ -76,6 +115,17 @@ class CategoryRule(BaseModel):
     confidence: float = Field(default=0.9, ge=0, le=1)
 
 
+class CategoryRuleCreate(BaseModel):
+    pattern: str = Field(min_length=2)
+    category: str = Field(min_length=2)
+    transaction_type: TransactionType = TransactionType.expense
+    confidence: float = Field(default=0.9, ge=0, le=1)
+
+
+class CategorizeBatchRequest(BaseModel):
+    merchants: list[Annotated[str, Field(min_length=2)]] = Field(min_length=1, max_length=10000)
+
+
 class Insight(BaseModel):
     id: str
     title: str
@@ -105,10 +155,771 @@ class AnalyticsResponse(BaseModel):
     insights: list[Insight]
 
 
+class DashboardAggregates:
+    """Running dashboard totals maintained incrementally on every transaction write.
+
+    Holds the current-month income and expense totals and per-category expense
+    spend so dashboard reads never rescan the full transaction history.
+    """
+
+    def __init__(self, month_start: Date) -> None:
+        self.month_start = month_start
+        self.monthly_income = 0.0
+        self.monthly_expenses = 0.0
+        self.category_spend: dict[str, float] = {}
+        self.category_counts: dict[str, int] = {}
+
+    def add(self, item: Transaction) -> None:
+        if item.date < self.month_start:
+            return
+        if item.type == TransactionType.income:
+            self.monthly_income += item.amount
+        elif item.type == TransactionType.expense:
+            self.monthly_expenses += item.amount
+            self.category_spend[item.category] = self.category_spend.get(item.category, 0.0) + item.amount
+            self.category_counts[item.category] = self.category_counts.get(item.category, 0) + 1
+
+    def remove(self, item: Transaction) -> None:
+        if item.date < self.month_start:
+            return
+        if item.type == TransactionType.income:
+            self.monthly_income -= item.amount
+        elif item.type == TransactionType.expense:
+            self.monthly_expenses -= item.amount
+            remaining = self.category_counts[item.category] - 1
+            if remaining:
+                self.category_counts[item.category] = remaining
+                self.category_spend[item.category] -= item.amount
+            else:
+                # Drop emptied categories outright so float residue never surfaces as spend.
+                del self.category_counts[item.category]
+                del self.category_spend[item.category]
+
+
+TYPE_CODES = {transaction_type: code for code, transaction_type in enumerate(TransactionType)}
+TYPE_VALUES = {transaction_type.value for transaction_type in TransactionType}
+
+
+def month_index(value: Date) -> int:
+    return value.year * 12 + value.month - 1
+
+
+class TransactionColumns:
+    """Columnar NumPy mirror of the transaction store for vectorized analytics.
+
+    Rows live in parallel arrays indexed by the owning store's slot number.
+    Deletes clear the slot's live flag; the store compacts both together.
+    """
+
+    COLUMNS = ("date_ordinal", "month", "amount", "type_code", "live")
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self.size = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int) -> None:
+        self.date_ordinal = np.zeros(capacity, dtype=np.int32)
+        self.month = np.zeros(capacity, dtype=np.int32)
+        self.amount = np.zeros(capacity, dtype=np.float64)
+        self.type_code = np.zeros(capacity, dtype=np.int8)
+        self.live = np.zeros(capacity, dtype=bool)
+
+    def _resize(self, capacity: int, keep: np.ndarray | slice) -> None:
+        for name in self.COLUMNS:
+            current = getattr(self, name)[keep]
+            column = np.zeros(capacity, dtype=current.dtype)
+            column[: len(current)] = current
+            setattr(self, name, column)
+
+    def add(self, item: Transaction) -> None:
+        slot = self.size
+        if slot == len(self.live):
+            self._resize(max(2 * slot, 1024), slice(0, slot))
+        self.date_ordinal[slot] = item.date.toordinal()
+        self.month[slot] = month_index(item.date)
+        self.amount[slot] = item.amount
+        self.type_code[slot] = TYPE_CODES[item.type]
+        self.live[slot] = True
+        self.size += 1
+
+    def extend(self, items: list[Transaction]) -> None:
+        start = self.size
+        end = start + len(items)
+        if end > len(self.live):
+            self._resize(max(2 * end, 1024), slice(0, start))
+        self.date_ordinal[start:end] = [item.date.toordinal() for item in items]
+        self.month[start:end] = [month_index(item.date) for item in items]
+        self.amount[start:end] = [item.amount for item in items]
+        self.type_code[start:end] = [TYPE_CODES[item.type] for item in items]
+        self.live[start:end] = True
+        self.size = end
+
+    def remove(self, slot: int) -> None:
+        self.live[slot] = False
+
+    def compact(self) -> None:
+        keep = np.flatnonzero(self.live[: self.size])
+        self._resize(max(2 * len(keep), 1024), keep)
+        self.size = len(keep)
+
+    def monthly_totals(self, first_month: int, months: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return per-month income, expense and row-count arrays starting at first_month."""
+        size = self.size
+        bucket = self.month[:size] - first_month
+        mask = self.live[:size] & (bucket >= 0) & (bucket < months)
+        keys = bucket[mask] * len(TYPE_CODES) + self.type_code[:size][mask]
+        bins = months * len(TYPE_CODES)
+        sums = np.bincount(keys, weights=self.amount[:size][mask], minlength=bins).reshape(months, len(TYPE_CODES))
+        counts = np.bincount(keys, minlength=bins).reshape(months, len(TYPE_CODES))
+        return sums[:, TYPE_CODES[TransactionType.income]], sums[:, TYPE_CODES[TransactionType.expense]], counts.sum(axis=1)
+
+
+def encode_model(item: BaseModel) -> bytes:
+    return item.model_dump_json().encode()
+
+
+def json_array(parts: Iterable[bytes]) -> bytes:
+    return b"[" + b",".join(parts) + b"]"
+
+
+def json_object(fields: dict[str, bytes]) -> bytes:
+    """Join already-encoded JSON values into an object without decoding them."""
+    return b"{" + b",".join(json.dumps(key).encode() + b":" + value for key, value in fields.items()) + b"}"
+
+
+def json_response(content: bytes, status_code: int = 200) -> Response:
+    """Send pre-encoded JSON as-is; the route's response_model still documents the schema."""
+    return Response(content=content, media_type="application/json", status_code=status_code)
+
+
+def search_fields(item: Transaction) -> list[str]:
+    fields = [item.merchant.lower(), item.category.lower()]
+    if item.note:
+        fields.append(item.note.lower())
+    return fields
+
+
+def trigrams(text: str) -> set[str]:
+    return {text[index : index + 3] for index in range(len(text) - 2)}
+
+
+def transaction_key(item: Transaction) -> tuple[int, str]:
+    return item.date.toordinal(), item.id
+
+
+def encode_cursor(item: Transaction) -> str:
+    return urlsafe_b64encode(f"{item.date.isoformat()}|{item.id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[int, str]:
+    """Decode an opaque page cursor into the ``(date ordinal, id)`` key of the last row served."""
+    try:
+        value = urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        day, transaction_id = value.split("|", 1)
+        return Date.fromisoformat(day).toordinal(), transaction_id
+    except (ValueError, UnicodeDecodeError, binascii.Error):
+        raise ValueError("invalid cursor") from None
+
+
+def filter_transactions(rows: Iterable[Transaction], category: str | None, transaction_type: TransactionType | None) -> Iterator[Transaction]:
+    wanted = category.lower() if category else None
+    for item in rows:
+        if wanted and item.category.lower() != wanted:
+            continue
+        if transaction_type and item.type != transaction_type:
+            continue
+        yield item
+
+
+class TrigramIndex:
+    """Trigram inverted index over transaction merchant, category and note text.
+
+    A search intersects the posting lists of the needle's trigrams, smallest
+    first, and leaves only a small candidate set to verify with a substring
+    check. Needles shorter than three characters cannot be indexed.
+    """
+
+    def __init__(self) -> None:
+        self._postings: dict[str, set[str]] = {}
+
+    @staticmethod
+    def _grams(item: Transaction) -> set[str]:
+        grams: set[str] = set()
+        for field in search_fields(item):
+            grams |= trigrams(field)
+        return grams
+
+    def add(self, item: Transaction) -> None:
+        for gram in self._grams(item):
+            self._postings.setdefault(gram, set()).add(item.id)
+
+    def remove(self, item: Transaction) -> None:
+        for gram in self._grams(item):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(item.id)
+                if not posting:
+                    del self._postings[gram]
+
+    def candidates(self, needle: str) -> set[str] | None:
+        """Return ids that may contain the lowercased needle, or None when it is too short to index."""
+        grams = trigrams(needle)
+        if not grams:
+            return None
+        postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+        matches = set(postings[0])
+        for posting in postings[1:]:
+            if not matches:
+                break
+            matches &= posting
+        return matches
+
+
+MERCHANT_NOISE = re.compile(r"[^a-z]+")
+
+# (cadence, interval in days, tolerance in days) for the median gap between charges.
+RECURRING_CADENCES = (("weekly", 7.0, 2.0), ("biweekly", 14.0, 3.0), ("monthly", 30.44, 5.0), ("annual", 365.25, 20.0))
+RECURRING_MIN_OCCURRENCES = 3
+RECURRING_MIN_CONFIDENCE = 0.5
+
+
+@lru_cache(maxsize=65536)
+def normalize_merchant(merchant: str) -> str:
+    """Reduce a statement merchant to a grouping key: letters only, no store numbers or single-letter noise."""
+    return " ".join(token for token in MERCHANT_NOISE.sub(" ", merchant.lower()).split() if len(token) > 1)
+
+
+def add_months(value: Date, months: int) -> Date:
+    month = value.month - 1 + months
+    year = value.year + month // 12
+    month = month % 12 + 1
+    return value.replace(year=year, month=month, day=min(value.day, calendar.monthrange(year, month)[1]))
+
+
+def next_occurrence(last: Date, cadence: str, interval: float) -> Date:
+    if cadence == "monthly":
+        return add_months(last, 1)
+    if cadence == "annual":
+        return add_months(last, 12)
+    return last + timedelta(days=round(interval))
+
+
+def detect_cadence(rows: list[Transaction]) -> tuple[int, dict] | None:
+    """Fit a cadence to one merchant's date-ordered rows.
+
+    Returns the last ordinal at which the pattern still counts as active and
+    the candidate, or None when the gaps do not match a known cadence.
+    """
+    ordinals: list[int] = []
+    for item in rows:
+        ordinal = item.date.toordinal()
+        if not ordinals or ordinal != ordinals[-1]:
+            ordinals.append(ordinal)
+    intervals = [later - earlier for earlier, later in zip(ordinals, ordinals[1:])]
+    if len(intervals) < RECURRING_MIN_OCCURRENCES - 1:
+        return None
+    typical = median(intervals)
+    match = next((cadence for cadence in RECURRING_CADENCES if abs(typical - cadence[1]) <= cadence[2]), None)
+    if match is None:
+        return None
+    cadence, days, tolerance = match
+    jitter = sum(abs(interval - typical) for interval in intervals) / len(intervals)
+    regularity = 1 - jitter / tolerance
+    if regularity <= 0:
+        return None
+
+    amounts = [item.amount for item in rows]
+    average = sum(amounts) / len(amounts)
+    deviation = (sum((amount - average) ** 2 for amount in amounts) / len(amounts)) ** 0.5
+    stability = max(0.0, 1 - deviation / average) if average else 0.0
+    # Least-squares slope of amount per occurrence, relative to the average charge.
+    center = (len(amounts) - 1) / 2
+    spread = sum((index - center) ** 2 for index in range(len(amounts)))
+    slope = sum((index - center) * (amount - average) for index, amount in enumerate(amounts)) / spread if spread else 0.0
+    drift = slope / average if average else 0.0
+
+    support = min(1.0, len(intervals) / 6)
+    confidence = round(0.5 * regularity + 0.25 * stability + 0.25 * support, 2)
+    if confidence < RECURRING_MIN_CONFIDENCE:
+        return None
+    latest = rows[-1]
+    return ordinals[-1] + round(2 * days + tolerance), {
+        "merchant": latest.merchant,
+        "category": latest.category,
+        "amount": latest.amount,
+        "cadence": cadence,
+        "confidence": confidence,
+        "nextExpectedDate": next_occurrence(latest.date, cadence, typical).isoformat(),
+        "intervalDays": round(typical, 1),
+        "jitterDays": round(jitter, 2),
+        "amountDrift": round(drift, 4),
+        "occurrences": len(rows),
+        "source": "detected",
+    }
+
+
+def flagged_candidate(rows: list[Transaction]) -> dict | None:
+    """Candidate for a merchant the user flagged recurring but without enough history to fit."""
+    item = next((row for row in reversed(rows) if row.recurring), None)
+    if item is None:
+        return None
+    return {
+        "merchant": item.merchant,
+        "category": item.category,
+        "amount": item.amount,
+        "cadence": "monthly",
+        "confidence": item.confidence,
+        "nextExpectedDate": (item.date + timedelta(days=30)).isoformat(),
+        "intervalDays": None,
+        "jitterDays": None,
+        "amountDrift": None,
+        "occurrences": len(rows),
+        "source": "flagged",
+    }
+
+
+class RecurringGroup:
+    """One merchant's rows, keyed by ``(date ordinal, id)`` and sorted lazily."""
+
+    __slots__ = ("keys", "items", "ordered")
+
+    def __init__(self) -> None:
+        self.keys: list[tuple[int, str]] = []
+        self.items: dict[str, Transaction] = {}
+        self.ordered = True
+
+    def add(self, item: Transaction) -> None:
+        key = transaction_key(item)
+        if self.keys and key < self.keys[-1]:
+            self.ordered = False
+        self.keys.append(key)
+        self.items[item.id] = item
+
+    def remove(self, item: Transaction) -> None:
+        self._sort()
+        key = transaction_key(item)
+        position = bisect_left(self.keys, key)
+        if position < len(self.keys) and self.keys[position] == key:
+            del self.keys[position]
+        self.items.pop(item.id, None)
+
+    def _sort(self) -> None:
+        if not self.ordered:
+            self.keys.sort()
+            self.ordered = True
+
+    def pattern(self) -> tuple[int | None, dict] | None:
+        self._sort()
+        rows = [self.items[transaction_id] for _, transaction_id in self.keys]
+        detected = detect_cadence(rows)
+        if detected is not None:
+            return detected
+        flagged = flagged_candidate(rows)
+        return None if flagged is None else (None, flagged)
+
+
+class RecurringDetector:
+    """Recurring-charge detection over transactions grouped by normalized merchant.
+
+    Writes only append to (or bisect out of) the row's merchant group and mark
+    it dirty. Reads re-sort and re-fit just the dirty groups, so keeping the
+    candidates current costs O(k log k) for a group of k rows touched since
+    the last read, and O(n log n) when a whole history arrives at once.
+    Merchants flagged recurring without enough history to fit a cadence keep
+    the old assumption of a monthly charge.
+    """
+
+    def __init__(self) -> None:
+        self._groups: dict[tuple[str, TransactionType], RecurringGroup] = {}
+        self._patterns: dict[tuple[str, TransactionType], tuple[int | None, dict]] = {}
+        self._dirty: set[tuple[str, TransactionType]] = set()
+
+    @staticmethod
+    def _key(item: Transaction) -> tuple[str, TransactionType]:
+        return normalize_merchant(item.merchant) or item.merchant.lower(), item.type
+
+    def add(self, item: Transaction) -> None:
+        key = self._key(item)
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = RecurringGroup()
+        group.add(item)
+        self._dirty.add(key)
+
+    def remove(self, item: Transaction) -> None:
+        key = self._key(item)
+        group = self._groups.get(key)
+        if group is None:
+            return
+        group.remove(item)
+        if group.items:
+            self._dirty.add(key)
+        else:
+            del self._groups[key]
+            self._patterns.pop(key, None)
+            self._dirty.discard(key)
+
+    def candidates(self, as_of: Date) -> list[dict]:
+        """Return active recurring candidates, soonest expected charge first."""
+        dirty, self._dirty = self._dirty, set()
+        for key in dirty:
+            group = self._groups.get(key)
+            pattern = group.pattern() if group is not None else None
+            if pattern is None:
+                self._patterns.pop(key, None)
+            else:
+                self._patterns[key] = pattern
+        # Detected patterns lapse once two intervals pass without a charge.
+        today = as_of.toordinal()
+        active = [candidate for active_until, candidate in self._patterns.values() if active_until is None or active_until >= today]
+        return sorted(active, key=lambda candidate: candidate["nextExpectedDate"])
+
+
+def current_row(key: tuple[int, str], index: dict[str, int], slots: list[Transaction | None]) -> Transaction | None:
+    """The live row a date-index key points at, or None if it was deleted or moved."""
+    slot = index.get(key[1])
+    item = None if slot is None else slots[slot]
+    if item is None or item.date.toordinal() != key[0]:
+        return None
+    return item
+
+
+# Candidate sets smaller than 1/16 of the store are sorted; larger ones filter the date index.
+SEARCH_DENSE_RATIO = 16
+
+# Rows whose JSON encoding is kept for paged reads, least recently used evicted first.
+ENCODED_CACHE_SIZE = 4096
+
+
+class TransactionStore:
+    """In-memory transaction store with an id index and a date-ordered index.
+
+    Rows occupy append-only slots found through an id -> slot hash index, so
+    lookups, updates and deletes are O(1). Deletes leave a tombstone in the
+    slot; tombstones are compacted away once they outnumber live rows.
+
+    A sorted ``(date ordinal, id)`` index makes date-range selection a bisect
+    plus a slice and lets newest-first listings walk the index backwards
+    without sorting. Its entries are dropped lazily: keys whose row was
+    deleted or moved to another date are skipped on read and purged on
+    compaction. The dashboard aggregates, the columnar mirror, the search
+    index and the recurring detector are updated on the same write path.
+
+    Paged reads keep each row's JSON encoding in a bounded LRU until the row
+    is updated, deleted or evicted; full listings and exports reuse cached
+    encodings but encode the rest on the fly, so memory stays bounded.
+
+    Sync endpoints run on a threadpool, so writes and reads of the search
+    index and recurring detector hold the store lock; those structures are
+    iterated and copied on read and must not change underneath.
+    """
+
+    def __init__(self, items: Iterable[Transaction] = (), month_start: Date | None = None) -> None:
+        self._slots: list[Transaction | None] = []
+        self._index: dict[str, int] = {}
+        self._order: list[tuple[int, str]] = []
+        self._tombstones = 0
+        self.aggregates = DashboardAggregates(month_start or Date.today().replace(day=1))
+        self.columns = TransactionColumns()
+        self.search_index = TrigramIndex()
+        self.recurring = RecurringDetector()
+        self._encoded: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.RLock()
+        for item in items:
+            self.add(item)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __iter__(self) -> Iterator[Transaction]:
+        return (item for item in self._slots.copy() if item is not None)
+
+    def get(self, transaction_id: str) -> Transaction | None:
+        with self._lock:
+            slot = self._index.get(transaction_id)
+            return None if slot is None else self._slots[slot]
+
+    def add(self, item: Transaction) -> None:
+        with self._lock:
+            self._insert(item)
+        bump_store_generation()
+
+    def encoded(self, item: Transaction, cache: bool = False) -> bytes:
+        """Return the row's JSON bytes, reusing a cached encoding of this row version.
+
+        With ``cache`` a fresh encoding is kept, evicting the least recently
+        used row beyond ENCODED_CACHE_SIZE.
+        """
+        with self._lock:
+            current = self.get(item.id) is item
+            data = self._encoded.get(item.id) if current else None
+            if data is not None:
+                self._encoded.move_to_end(item.id)
+        if data is None:
+            data = encode_model(item)
+            if current and cache:
+                with self._lock:
+                    # An update racing this read may have replaced the row meanwhile.
+                    if self.get(item.id) is item:
+                        self._encoded[item.id] = data
+                        if len(self._encoded) > ENCODED_CACHE_SIZE:
+                            self._encoded.popitem(last=False)
+        return data
+
+    def update(self, transaction_id: str, changes: dict) -> Transaction | None:
+        # Read, validate and swap under the lock so a racing delete or update
+        # is never undone by this write.
+        with self._lock:
+            current = self.get(transaction_id)
+            if current is None:
+                return None
+            updated = Transaction.model_validate({**current.model_dump(), **changes})
+            self._retire(transaction_id)
+            self._insert(updated)
+        bump_store_generation()
+        return updated
+
+    def remove(self, transaction_id: str) -> Transaction | None:
+        with self._lock:
+            item = self._retire(transaction_id)
+        if item is not None:
+            bump_store_generation()
+        return item
+
+    def extend(self, items: list[Transaction]) -> None:
+        """Append a chunk of new rows, merging their date keys in one sort."""
+        keys = sorted((item.date.toordinal(), item.id) for item in items)
+        with self._lock:
+            for item in items:
+                self._slots.append(item)
+                self._index[item.id] = len(self._slots) - 1
+                self.aggregates.add(item)
+                self.search_index.add(item)
+                self.recurring.add(item)
+            self.columns.extend(items)
+            if self._order and keys and keys[0] < self._order[-1]:
+                # Timsort merges the two sorted runs in linear time; the merged
+                # list replaces the old one so readers keep a sorted snapshot.
+                self._order = sorted(self._order + keys)
+            else:
+                self._order.extend(keys)
+        bump_store_generation()
+
+    def _insert(self, item: Transaction) -> None:
+        key = (item.date.toordinal(), item.id)
+        if not self._order or key > self._order[-1]:
+            self._order.append(key)
+        else:
+            # Backdated rows pay a binary search plus a single list shift; a
+            # stale key left by an earlier move to another date is reused.
+            position = bisect_left(self._order, key)
+            if position == len(self._order) or self._order[position] != key:
+                self._order.insert(position, key)
+        self._place(item)
+
+    def _place(self, item: Transaction) -> None:
+        # Append before indexing so an unlocked reader never sees a slot past the end.
+        self._slots.append(item)
+        self._index[item.id] = len(self._slots) - 1
+        self.aggregates.add(item)
+        self.columns.add(item)
+        self.search_index.add(item)
+        self.recurring.add(item)
+
+    def _retire(self, transaction_id: str) -> Transaction | None:
+        slot = self._index.pop(transaction_id, None)
+        if slot is None:
+            return None
+        item = self._slots[slot]
+        self._slots[slot] = None
+        self._tombstones += 1
+        self.aggregates.remove(item)
+        self.columns.remove(slot)
+        self.search_index.remove(item)
+        self.recurring.remove(item)
+        self._encoded.pop(transaction_id, None)
+        if self._tombstones > 1024 and self._tombstones * 2 > len(self._slots):
+            self.compact()
+        return item
+
+    def compact(self) -> None:
+        """Drop tombstoned slots and stale date-index keys.
+
+        New lists replace the old ones rather than shrinking them in place, so
+        readers walking a snapshot keep a consistent view.
+        """
+        with self._lock:
+            slots = [item for item in self._slots if item is not None]
+            index = {item.id: slot for slot, item in enumerate(slots)}
+            self._order = [key for key in self._order if current_row(key, index, slots) is not None]
+            self._slots, self._index = slots, index
+            self.columns.compact()
+            self._tombstones = 0
+
+    def recurring_candidates(self, as_of: Date) -> list[dict]:
+        """Recurring candidates as of a date, re-fit under the store lock."""
+        with self._lock:
+            return self.recurring.candidates(as_of)
+
+    def _snapshot(self) -> tuple[list[tuple[int, str]], dict[str, int], list[Transaction | None]]:
+        """The date index, id index and slots as one consistent set of references.
+
+        Between compactions these only grow, and compaction swaps in new
+        objects, so a reader can walk a snapshot without holding the lock.
+        """
+        with self._lock:
+            return self._order, self._index, self._slots
+
+    def since(self, start: Date) -> list[Transaction]:
+        order, index, slots = self._snapshot()
+        position = bisect_left(order, (start.toordinal(), ""))
+        rows = (current_row(key, index, slots) for key in order[position:])
+        return [item for item in rows if item is not None]
+
+    def newest_first(self) -> Iterator[Transaction]:
+        return self.older_than(None)
+
+    def older_than(self, key: tuple[int, str] | None) -> Iterator[Transaction]:
+        """Walk rows newest first, starting strictly below a ``(date ordinal, id)`` key."""
+        order, index, slots = self._snapshot()
+        position = len(order) if key is None else bisect_left(order, key)
+        for offset in range(position - 1, -1, -1):
+            item = current_row(order[offset], index, slots)
+            if item is not None:
+                yield item
+
+    def search(self, text: str) -> list[Transaction]:
+        """Return rows whose merchant, category or note contains text, newest first."""
+        return list(self.search_older_than(text, None))
+
+    def search_older_than(self, text: str, key: tuple[int, str] | None) -> Iterator[Transaction]:
+        """Lazily walk matching rows newest first, starting strictly below a ``(date ordinal, id)`` key.
+
+        Needles too short to index filter the date index as it is walked from
+        the key, so a page costs as many rows as it takes to fill it. Indexed
+        needles first intersect their posting lists (linear in the smallest
+        list); when the candidates are dense the date index is walked from the
+        key and filtered by membership, so the walk costs
+        O(limit * SEARCH_DENSE_RATIO). Sparse candidates below the key are
+        sorted instead, O(m log m) for m matches.
+        """
+        needle = text.lower()
+        with self._lock:
+            candidates = self.search_index.candidates(needle)
+            sparse = candidates is not None and len(candidates) * SEARCH_DENSE_RATIO < len(self._index)
+            if sparse:
+                matched = [item for item in map(self.get, candidates) if item is not None and (key is None or transaction_key(item) < key)]
+        if sparse:
+            rows: Iterable[Transaction] = sorted(matched, key=transaction_key, reverse=True)
+        elif candidates is None:
+            rows = self.older_than(key)
+        else:
+            rows = (item for item in self.older_than(key) if item.id in candidates)
+        return (item for item in rows if any(needle in field for field in search_fields(item)))
+
+
+# Bumped on every mutation of transactions, budgets, goals or rules.
+store_generation = 0
+store_generation_lock = threading.Lock()
+
+BuilderResult = TypeVar("BuilderResult")
+
+
+def bump_store_generation() -> None:
+    global store_generation
+    # Writers bump from threadpool threads; an unlocked += can lose a bump.
+    with store_generation_lock:
+        store_generation += 1
+
+
+def generation_cached(builder: Callable[[], BuilderResult]) -> Callable[[], BuilderResult]:
+    """Compute a dashboard builder at most once per store generation and day.
+
+    Builders such as the recurring candidates depend on today's date, so the
+    day is part of the key. Cached results are shared between callers and
+    requests, so they must be treated as read-only.
+    """
+    cached: list = [None, None]
+
+    @wraps(builder)
+    def wrapper() -> BuilderResult:
+        key = (store_generation, Date.today())
+        if cached[0] != key:
+            # Stamp with the key read before computing so a concurrent write forces a recompute.
+            cached[1] = builder()
+            cached[0] = key
+        return cached[1]
+
+    return wrapper
+
+
+def merchant_key(merchant: str) -> str:
+    return " ".join(merchant.lower().split())
+
+
+class RuleMatcher:
+    """Aho-Corasick automaton over the normalized category rule patterns.
+
+    Patterns and merchants both go through ``merchant_key``, so case and runs
+    of whitespace never decide a match. Every pattern is matched in a single
+    pass over the merchant string. Each state records the lowest rule position
+    it (or any suffix state) completes, so the earliest matching rule in list
+    order wins, as with a linear scan.
+    """
+
+    def __init__(self, rules: list[CategoryRule]) -> None:
+        self.rules = list(rules)
+        no_match = len(self.rules)
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail = [0]
+        self._best = [no_match]
+        for position, rule in enumerate(self.rules):
+            pattern = merchant_key(rule.pattern)
+            if not pattern:
+                # A blank pattern would match every merchant.
+                continue
+            node = 0
+            for char in pattern:
+                child = self._goto[node].get(char)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto[node][char] = child
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._best.append(no_match)
+                node = child
+            self._best[node] = min(self._best[node], position)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._best[child] = min(self._best[child], self._best[self._fail[child]])
+
+    def match(self, merchant: str) -> CategoryRule | None:
+        node = 0
+        found = self._best[0]
+        for char in merchant_key(merchant):
+            if not found:
+                break
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            if self._best[node] < found:
+                found = self._best[node]
+        return self.rules[found] if found < len(self.rules) else None
+
+
 TODAY = Date.today()
 CURRENT_MONTH_START = TODAY.replace(day=1)
 
-transactions: list[Transaction] = [
+transactions = TransactionStore([
     Transaction(date=CURRENT_MONTH_START, merchant="TechTide Labs", category="Salary", amount=8250, type="income", account="Everyday Checking", recurring=True, confidence=0.99),
     Transaction(date=CURRENT_MONTH_START + timedelta(days=1), merchant="Figma Subscription", category="Software", amount=18, type="expense", account="Founder Card", recurring=True, confidence=0.96),
     Transaction(date=CURRENT_MONTH_START + timedelta(days=2), merchant="Developer Tools", category="Software", amount=20, type="expense", account="Founder Card", recurring=True, confidence=0.98),
@@ -121,7 +932,7 @@ transactions: list[Transaction] = [
     Transaction(date=CURRENT_MONTH_START + timedelta(days=9), merchant="Client Retainer", category="Consulting", amount=2100, type="income", account="Business Reserve", recurring=True, confidence=0.94),
     Transaction(date=CURRENT_MONTH_START + timedelta(days=10), merchant="Amazon", category="Shopping", amount=76.19, type="expense", account="Founder Card", confidence=0.84),
     Transaction(date=CURRENT_MONTH_START + timedelta(days=11), merchant="Delta", category="Travel", amount=348.27, type="expense", account="Founder Card", confidence=0.89),
-]
+], month_start=CURRENT_MONTH_START)
 
 budgets: list[Budget] = [
     Budget(category="Housing", limit=2600, color="#f97316"),
@@ -147,19 +958,35 @@ rules: list[CategoryRule] = [
     CategoryRule(pattern="landlord", category="Housing", confidence=0.99),
 ]
 
+_rule_matcher: RuleMatcher | None = None
+# Bumped with the rules; part of the categorization cache key so a lookup racing a rule change cannot cache a stale answer.
+rules_version = 0
 
-def month_key(value: Date) -> str:
-    return value.strftime("%b %Y")
+
+def rule_matcher() -> RuleMatcher:
+    """Return the automaton for the current rules, compiling it on first use after a change."""
+    global _rule_matcher
+    if _rule_matcher is None:
+        _rule_matcher = RuleMatcher(rules)
+    return _rule_matcher
 
 
-def monthly_transactions() -> list[Transaction]:
-    return [item for item in transactions if item.date >= CURRENT_MONTH_START]
+def rules_changed() -> None:
+    global _rule_matcher, rules_version
+    _rule_matcher = None
+    rules_version += 1
+    categorize_key.cache_clear()
+    bump_store_generation()
 
 
+def month_key(value: Date) -> str:
+    return value.strftime("%b %Y")
+
+
+@generation_cached
 def build_summary() -> DashboardSummary:
-    current = monthly_transactions()
-    income = sum(item.amount for item in current if item.type == TransactionType.income)
-    expenses = sum(item.amount for item in current if item.type == TransactionType.expense)
+    income = transactions.aggregates.monthly_income
+    expenses = transactions.aggregates.monthly_expenses
     cash_flow = income - expenses
     total_budget = sum(item.limit for item in budgets)
     budget_used_percent = round((expenses / total_budget) * 100, 2) if total_budget else 0
@@ -178,11 +1005,9 @@ def build_summary() -> DashboardSummary:
     )
 
 
+@generation_cached
 def build_category_spend() -> list[dict]:
-    spend_by_category: dict[str, float] = defaultdict(float)
-    for item in monthly_transactions():
-        if item.type == TransactionType.expense:
-            spend_by_category[item.category] += item.amount
+    spend_by_category = transactions.aggregates.category_spend
     budget_lookup = {item.category: item for item in budgets}
     return [
         {
@@ -196,22 +1021,32 @@ def build_category_spend() -> list[dict]:
     ]
 
 
+@generation_cached
 def build_monthly_trend() -> list[dict]:
     rows = []
     base_income = 7800
     base_expense = 4200
+    anchors = [add_months(CURRENT_MONTH_START, -index) for index in range(6)]
+    first_month = month_index(anchors[-1])
+    income_by_month, expenses_by_month, rows_by_month = transactions.columns.monthly_totals(first_month, len(anchors))
     for index in range(5, -1, -1):
-        anchor = (CURRENT_MONTH_START - timedelta(days=30 * index)).replace(day=1)
+        anchor = anchors[index]
+        bucket = month_index(anchor) - first_month
         if index == 0:
-            income = sum(item.amount for item in monthly_transactions() if item.type == TransactionType.income)
-            expenses = sum(item.amount for item in monthly_transactions() if item.type == TransactionType.expense)
+            income = transactions.aggregates.monthly_income
+            expenses = transactions.aggregates.monthly_expenses
+        elif rows_by_month[bucket]:
+            income = float(income_by_month[bucket])
+            expenses = float(expenses_by_month[bucket])
         else:
+            # Months without recorded history fall back to the seeded demo baseline.
             income = base_income + (5 - index) * 180
             expenses = base_expense + ((index % 3) * 240) - (5 - index) * 80
         rows.append({"month": month_key(anchor), "income": round(income, 2), "expenses": round(expenses, 2), "savings": round(income - expenses, 2)})
     return rows
 
 
+@generation_cached
 def build_forecast() -> list[dict]:
     current = build_summary()
     trend = build_monthly_trend()
@@ -226,24 +1061,16 @@ def build_forecast() -> list[dict]:
     return rows
 
 
+@generation_cached
 def build_recurring_candidates() -> list[dict]:
-    return [
-        {
-            "merchant": item.merchant,
-            "category": item.category,
-            "amount": item.amount,
-            "cadence": "monthly",
-            "confidence": item.confidence,
-            "nextExpectedDate": (item.date + timedelta(days=30)).isoformat(),
-        }
-        for item in transactions
-        if item.recurring
-    ]
+    return transactions.recurring_candidates(Date.today())
 
 
+@generation_cached
 def build_insights() -> list[Insight]:
     summary = build_summary()
     category_spend = build_category_spend()
+    recurring_count = len(build_recurring_candidates())
     top_category = category_spend[0] if category_spend else {"category": "spending", "amount": 0, "usedPercent": 0}
     return [
         Insight(
@@ -265,14 +1092,266 @@ def build_insights() -> list[Insight]:
         Insight(
             id="automation",
             title="Automation opportunity detected",
-            description=f"MoneyFlow found {len(build_recurring_candidates())} recurring patterns that can power cash-flow forecasts.",
+            description=f"MoneyFlow found {recurring_count} recurring patterns that can power cash-flow forecasts.",
             severity="positive",
-            impact=len(build_recurring_candidates()),
+            impact=recurring_count,
             action="Turn recurring candidates into rules so future imports are categorized automatically.",
         ),
     ]
 
 
+@generation_cached
+def build_dashboard() -> AnalyticsResponse:
+    return AnalyticsResponse(
+        summary=build_summary(),
+        category_spend=build_category_spend(),
+        monthly_trend=build_monthly_trend(),
+        cashflow_forecast=build_forecast(),
+        recurring_candidates=build_recurring_candidates(),
+        insights=build_insights(),
+    )
+
+
+def fallback_category(merchant: str) -> str:
+    return "Dining" if any(word in merchant.lower() for word in ["coffee", "cafe", "restaurant"]) else "Shopping"
+
+
+@lru_cache(maxsize=65536)
+def categorize_key(key: str, version: int) -> tuple[str, float, str]:
+    """Memoized (category, confidence, source) for a normalized merchant under one rules version."""
+    matched_rule = rule_matcher().match(key)
+    if matched_rule:
+        return matched_rule.category, matched_rule.confidence, "rule"
+    return fallback_category(key), 0.72, "ai-fallback"
+
+
+def categorize(merchant: str) -> dict:
+    category, confidence, source = categorize_key(merchant_key(merchant), rules_version)
+    return {"merchant": merchant, "category": category, "confidence": confidence, "source": source}
+
+
+def categorized_transaction(payload: TransactionCreate, matched_rule: CategoryRule | None, default_confidence: float = 0.86) -> Transaction:
+    payload_data = payload.model_dump()
+    payload_data["category"] = matched_rule.category if matched_rule else payload.category
+    return Transaction(**payload_data, confidence=matched_rule.confidence if matched_rule else default_confidence)
+
+
+IMPORT_BATCH_SIZE = 5000
+IMPORT_ERROR_LIMIT = 100
+IMPORT_DATE_FORMATS = ("%m/%d/%Y", "%m/%d/%y", "%Y%m%d", "%d.%m.%Y")
+CSV_COLUMN_ALIASES = {
+    "date": ("date", "transaction date", "posted date", "posting date", "posted"),
+    "merchant": ("merchant", "payee", "name", "description"),
+    "amount": ("amount", "transaction amount"),
+    "debit": ("debit", "withdrawal"),
+    "credit": ("credit", "deposit"),
+    "type": ("type", "transaction type"),
+    "category": ("category",),
+    "account": ("account", "account name"),
+    "note": ("note", "notes", "memo"),
+}
+IMPORT_TYPE_ALIASES = {
+    "debit": "expense", "sale": "expense", "purchase": "expense", "pos": "expense", "fee": "expense", "atm": "expense",
+    "check": "expense", "withdrawal": "expense", "debitcard": "expense", "achdebit": "expense",
+    "credit": "income", "dep": "income", "deposit": "income", "int": "income", "interest": "income", "div": "income",
+    "directdep": "income", "achcredit": "income", "refund": "income", "return": "income",
+    "xfer": "transfer",
+}
+OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+
+
+def parse_import_date(value: str) -> Date:
+    text = value.strip()
+    try:
+        return Date.fromisoformat(text[:10])
+    except ValueError:
+        pass
+    for date_format in IMPORT_DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date()
+        except ValueError:
+            continue
+    raise ValueError(f"unrecognized date {value!r}")
+
+
+def parse_import_amount(value: str) -> float:
+    text = value.strip().replace("$", "").replace(",", "")
+    if text.startswith("(") and text.endswith(")"):
+        text = "-" + text[1:-1]
+    try:
+        return float(text)
+    except ValueError:
+        raise ValueError(f"unrecognized amount {value!r}") from None
+
+
+def parse_csv_statement(stream: BinaryIO) -> Iterator[tuple[int, dict[str, str]]]:
+    """Yield (row number, normalized fields) from a CSV statement, one row at a time."""
+    reader = csv.reader(io.TextIOWrapper(stream, encoding="utf-8-sig", errors="replace", newline=""))
+    header = [column.strip().lower() for column in next(reader, [])]
+    positions = {
+        field: next((header.index(alias) for alias in aliases if alias in header), None)
+        for field, aliases in CSV_COLUMN_ALIASES.items()
+    }
+    for row_number, row in enumerate(reader, start=2):
+        if not any(cell.strip() for cell in row):
+            continue
+        yield row_number, {field: row[position].strip() for field, position in positions.items() if position is not None and position < len(row) and row[position].strip()}
+
+
+def parse_ofx_statement(stream: BinaryIO, chunk_size: int = 65536) -> Iterator[tuple[int, dict[str, str]]]:
+    """Yield (row number, normalized fields) for each STMTTRN block of an OFX/QFX statement.
+
+    The SGML (OFX 1.x) and XML (OFX 2.x) variants are both tokenized in
+    fixed-size chunks, so only the current tag and transaction are buffered.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8", errors="replace")
+    buffer = ""
+    current: dict[str, str] | None = None
+    row_number = 0
+    while True:
+        chunk = text.read(chunk_size)
+        buffer += chunk
+        # Hold back a trailing partial tag until the next chunk arrives.
+        cut = buffer.rfind("<") if chunk else -1
+        if cut == -1:
+            cut = len(buffer)
+        for closing, tag, value in OFX_TAG.findall(buffer[:cut]):
+            tag = tag.upper()
+            if tag == "STMTTRN":
+                if closing and current is not None:
+                    row_number += 1
+                    yield row_number, ofx_fields(current)
+                current = None if closing else {}
+            elif current is not None and not closing and value.strip():
+                current[tag] = value.strip()
+        buffer = buffer[cut:]
+        if not chunk:
+            break
+
+
+def ofx_fields(fields: dict[str, str]) -> dict[str, str]:
+    mapped = {"merchant": fields.get("NAME") or fields.get("PAYEE") or fields.get("MEMO", "")}
+    if "DTPOSTED" in fields:
+        mapped["date"] = fields["DTPOSTED"][:8]
+    if "TRNAMT" in fields:
+        mapped["amount"] = fields["TRNAMT"]
+    # Only transfers and credits override the amount sign; DEBIT, POS, FEE and friends stay expenses.
+    if IMPORT_TYPE_ALIASES.get(fields.get("TRNTYPE", "").lower()) in ("income", "transfer"):
+        mapped["type"] = fields["TRNTYPE"]
+    if fields.get("MEMO") and fields.get("NAME"):
+        mapped["note"] = fields["MEMO"]
+    return mapped
+
+
+def import_type(value: str, amount: float) -> str:
+    key = re.sub(r"[^a-z]", "", value.lower())
+    resolved = IMPORT_TYPE_ALIASES.get(key, key)
+    if resolved in TYPE_VALUES:
+        return resolved
+    # Missing, unknown and direction-neutral types ("Payment" is a debit on checking
+    # statements but a credit on card statements) follow the amount sign.
+    return "expense" if amount < 0 else "income"
+
+
+def import_payload(fields: dict[str, str], account: str) -> TransactionCreate:
+    if "amount" in fields:
+        amount = parse_import_amount(fields["amount"])
+    elif "debit" in fields:
+        amount = -abs(parse_import_amount(fields["debit"]))
+    elif "credit" in fields:
+        amount = abs(parse_import_amount(fields["credit"]))
+    else:
+        raise ValueError("missing amount")
+    if "date" not in fields:
+        raise ValueError("missing date")
+    merchant = fields.get("merchant", "")
+    return TransactionCreate(
+        date=parse_import_date(fields["date"]),
+        merchant=merchant,
+        category=fields.get("category") or fallback_category(merchant),
+        amount=abs(amount),
+        type=import_type(fields.get("type", ""), amount),
+        account=fields.get("account", account),
+        note=fields.get("note"),
+    )
+
+
+def categorize_import_batch(batch: list[tuple[TransactionCreate, bool]]) -> list[Transaction]:
+    matcher = rule_matcher()
+    matches: dict[str, CategoryRule | None] = {}
+    rows = []
+    for payload, has_category in batch:
+        key = merchant_key(payload.merchant)
+        if key not in matches:
+            matches[key] = matcher.match(key)
+        rows.append(categorized_transaction(payload, matches[key], 0.86 if has_category else 0.72))
+    return rows
+
+
+def import_statement(rows: Iterator[tuple[int, dict[str, str]]], account: str) -> dict:
+    """Validate, categorize and append parsed statement rows in bounded batches."""
+    imported = 0
+    failed = 0
+    errors: list[dict] = []
+    batch: list[tuple[TransactionCreate, bool]] = []
+    for row_number, fields in rows:
+        try:
+            batch.append((import_payload(fields, account), "category" in fields))
+        except (ValueError, ValidationError) as exc:
+            failed += 1
+            if len(errors) < IMPORT_ERROR_LIMIT:
+                errors.append({"row": row_number, "error": import_error_message(exc)})
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            transactions.extend(categorize_import_batch(batch))
+            imported += len(batch)
+            batch = []
+    if batch:
+        transactions.extend(categorize_import_batch(batch))
+        imported += len(batch)
+    return {"imported": imported, "failed": failed, "rows": imported + failed, "errors": errors, "errorsTruncated": failed > len(errors)}
+
+
+def import_error_message(exc: Exception) -> str:
+    if isinstance(exc, ValidationError):
+        return "; ".join(f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors())
+    return str(exc)
+
+
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+def export_lines() -> Iterator[bytes]:
+    """Yield one NDJSON export line per entity, preceded by a header record."""
+    header = {"type": "header", "exportedAt": datetime.utcnow().isoformat() + "Z", "transactions": len(transactions)}
+    yield json.dumps(header, separators=(",", ":")).encode() + b"\n"
+    sections = (("transaction", transactions, transactions.encoded), ("budget", list(budgets), encode_model), ("goal", list(goals), encode_model), ("rule", list(rules), encode_model))
+    for entity, items, encode in sections:
+        prefix = b'{"type":"' + entity.encode() + b'","data":'
+        for item in items:
+            yield prefix + encode(item) + b"}\n"
+
+
+def export_chunks(gzip_compress: bool = False) -> Iterator[bytes]:
+    """Encode export records as NDJSON in ~64 KiB chunks, optionally gzip-compressed on the fly."""
+    compressor = zlib.compressobj(wbits=31) if gzip_compress else None
+    pending: list[bytes] = []
+    pending_size = 0
+    for line in export_lines():
+        pending.append(line)
+        pending_size += len(line)
+        if pending_size >= EXPORT_CHUNK_BYTES:
+            chunk = b"".join(pending)
+            pending, pending_size = [], 0
+            chunk = compressor.compress(chunk) if compressor else chunk
+            if chunk:
+                yield chunk
+    tail = b"".join(pending)
+    if compressor:
+        tail = compressor.compress(tail) + compressor.flush()
+    if tail:
+        yield tail
+
+
 app = FastAPI(
     title="MoneyFlow API",
     description="intelligent budget tracker API with analytics, budgets, goals, rules, and forecast endpoints.",
@@ -300,14 +1379,7 @@ def health_check() -> dict:
 
 @app.get("/api/v1/dashboard", response_model=AnalyticsResponse)
 def get_dashboard() -> AnalyticsResponse:
-    return AnalyticsResponse(
-        summary=build_summary(),
-        category_spend=build_category_spend(),
-        monthly_trend=build_monthly_trend(),
-        cashflow_forecast=build_forecast(),
-        recurring_candidates=build_recurring_candidates(),
-        insights=build_insights(),
-    )
+    return build_dashboard()
 
 
 @app.get("/api/v1/transactions", response_model=list[Transaction])
@@ -315,35 +1387,83 @@ def list_transactions(
     search: str | None = None,
     category: str | None = None,
     transaction_type: TransactionType | None = None,
-) -> list[Transaction]:
-    rows = transactions
+) -> Response:
+    rows: Iterable[Transaction] = transactions.search(search) if search else transactions.newest_first()
+    return json_response(json_array(transactions.encoded(item) for item in filter_transactions(rows, category, transaction_type)))
+
+
+@app.get("/api/v1/transactions/page", response_model=TransactionPage)
+def list_transactions_page(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = None,
+    search: str | None = None,
+    category: str | None = None,
+    transaction_type: TransactionType | None = None,
+) -> Response:
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
     if search:
-        needle = search.lower()
-        rows = [item for item in rows if needle in item.merchant.lower() or needle in item.category.lower() or (item.note and needle in item.note.lower())]
-    if category:
-        rows = [item for item in rows if item.category.lower() == category.lower()]
-    if transaction_type:
-        rows = [item for item in rows if item.type == transaction_type]
-    return sorted(rows, key=lambda item: item.date, reverse=True)
+        rows: Iterable[Transaction] = transactions.search_older_than(search, after)
+    else:
+        rows = transactions.older_than(after)
+    items = list(islice(filter_transactions(rows, category, transaction_type), limit + 1))
+    next_cursor = encode_cursor(items[limit - 1]) if len(items) > limit else None
+    return json_response(json_object({
+        "items": json_array(transactions.encoded(item, cache=True) for item in items[:limit]),
+        "next_cursor": json.dumps(next_cursor).encode(),
+        "limit": str(limit).encode(),
+    }))
 
 
 @app.post("/api/v1/transactions", response_model=Transaction, status_code=201)
 def create_transaction(payload: TransactionCreate) -> Transaction:
-    matched_rule = next((rule for rule in rules if rule.pattern.lower() in payload.merchant.lower()), None)
-    payload_data = payload.model_dump()
-    payload_data["category"] = matched_rule.category if matched_rule else payload.category
-    transaction = Transaction(**payload_data, confidence=matched_rule.confidence if matched_rule else 0.86)
-    transactions.append(transaction)
+    transaction = categorized_transaction(payload, rule_matcher().match(payload.merchant))
+    transactions.add(transaction)
+    return transaction
+
+
+@app.post("/api/v1/transactions/import")
+def import_transactions(
+    file: UploadFile = File(...),
+    statement_format: Literal["csv", "ofx", "qfx"] | None = Query(None, alias="format"),
+    account: str = Query("Everyday Checking", min_length=2),
+) -> dict:
+    resolved_format = statement_format or (file.filename or "").rsplit(".", 1)[-1].lower()
+    if resolved_format == "csv":
+        rows = parse_csv_statement(file.file)
+    elif resolved_format in ("ofx", "qfx"):
+        rows = parse_ofx_statement(file.file)
+    else:
+        raise HTTPException(status_code=400, detail="Unsupported statement format; use csv, ofx or qfx")
+    return {"format": resolved_format, **import_statement(rows, account)}
+
+
+@app.get("/api/v1/transactions/{transaction_id}", response_model=Transaction)
+def get_transaction(transaction_id: str) -> Transaction:
+    transaction = transactions.get(transaction_id)
+    if transaction is None:
+        raise HTTPException(status_code=404, detail="Transaction not found")
+    return transaction
+
+
+@app.patch("/api/v1/transactions/{transaction_id}", response_model=Transaction)
+def update_transaction(transaction_id: str, payload: TransactionUpdate) -> Transaction:
+    try:
+        transaction = transactions.update(transaction_id, payload.model_dump(exclude_unset=True))
+    except ValidationError as exc:
+        raise HTTPException(status_code=422, detail=import_error_message(exc)) from None
+    if transaction is None:
+        raise HTTPException(status_code=404, detail="Transaction not found")
     return transaction
 
 
 @app.delete("/api/v1/transactions/{transaction_id}")
 def delete_transaction(transaction_id: str) -> dict:
-    for index, item in enumerate(transactions):
-        if item.id == transaction_id:
-            transactions.pop(index)
-            return {"deleted": True, "id": transaction_id}
-    raise HTTPException(status_code=404, detail="Transaction not found")
+    if transactions.remove(transaction_id) is None:
+        raise HTTPException(status_code=404, detail="Transaction not found")
+    return {"deleted": True, "id": transaction_id}
 
 
 @app.get("/api/v1/budgets", response_model=list[Budget])
@@ -361,24 +1481,51 @@ def list_rules() -> list[CategoryRule]:
     return rules
 
 
+@app.post("/api/v1/rules", response_model=CategoryRule, status_code=201)
+def create_rule(payload: CategoryRuleCreate) -> CategoryRule:
+    rule = CategoryRule(**payload.model_dump())
+    rules.append(rule)
+    rules_changed()
+    return rule
+
+
+@app.delete("/api/v1/rules/{rule_id}")
+def delete_rule(rule_id: str) -> dict:
+    for index, rule in enumerate(rules):
+        if rule.id == rule_id:
+            rules.pop(index)
+            rules_changed()
+            return {"deleted": True, "id": rule_id}
+    raise HTTPException(status_code=404, detail="Rule not found")
+
+
 @app.post("/api/v1/categorize")
 def categorize_merchant(merchant: str = Query(..., min_length=2)) -> dict:
-    matched_rule = next((rule for rule in rules if rule.pattern.lower() in merchant.lower()), None)
-    if matched_rule:
-        return {"merchant": merchant, "category": matched_rule.category, "confidence": matched_rule.confidence, "source": "rule"}
-    fallback = "Dining" if any(word in merchant.lower() for word in ["coffee", "cafe", "restaurant"]) else "Shopping"
-    return {"merchant": merchant, "category": fallback, "confidence": 0.72, "source": "ai-fallback"}
+    return categorize(merchant)
+
+
+@app.post("/api/v1/categorize/batch")
+def categorize_merchants(payload: CategorizeBatchRequest) -> dict:
+    return {"count": len(payload.merchants), "results": [categorize(merchant) for merchant in payload.merchants]}
+
+
+@app.get("/api/v1/export/stream")
+def export_data_stream(compress: Literal["gzip"] | None = None) -> StreamingResponse:
+    headers = {"Content-Disposition": 'attachment; filename="moneyflow-export.ndjson"'}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(export_chunks(gzip_compress=compress == "gzip"), media_type="application/x-ndjson", headers=headers)
 
 
 @app.get("/api/v1/export")
-def export_data() -> dict:
-    return {
-        "exportedAt": datetime.utcnow().isoformat() + "Z",
-        "transactions": [item.model_dump(mode="json") for item in transactions],
-        "budgets": [item.model_dump(mode="json") for item in budgets],
-        "goals": [item.model_dump(mode="json") for item in goals],
-        "rules": [item.model_dump(mode="json") for item in rules],
-    }
+def export_data() -> Response:
+    return json_response(json_object({
+        "exportedAt": json.dumps(datetime.utcnow().isoformat() + "Z").encode(),
+        "transactions": json_array(transactions.encoded(item) for item in transactions),
+        "budgets": json_array(encode_model(item) for item in budgets),
+        "goals": json_array(encode_model(item) for item in goals),
+        "rules": json_array(encode_model(item) for item in rules),
+    }))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,54 @@
+"""
+Shared fixtures for the MoneyFlow backend tests.
+
+The SQL app binds its engines to ``DATABASE_URL`` at import time, so the
+throwaway database is configured before any ``app`` module is imported.
+Async code runs on one session-wide event loop, which also owns the pooled
+aiosqlite connections.
+"""
+
+import asyncio
+import os
+import tempfile
+
+_database_dir = tempfile.mkdtemp(prefix="moneyflow-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_database_dir, 'moneyflow.db')}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def run():
+    """Run a coroutine to completion on the shared event loop."""
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def database(run):
+    """Create, migrate and seed the test database once per session."""
+    from app.core.database import create_tables, init_db
+
+    run(create_tables())
+    init_db()
+
+
+@pytest.fixture
+def client(run, database):
+    """HTTP client wired straight to the SQL app."""
+    from app.main import app
+
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver")
+    yield client
+    run(client.aclose())
+
+
+@pytest.fixture
+def auth_headers():
+    """Bearer token for the seeded demo user."""
+    from app.core.security import create_access_token
+
+    return {"Authorization": f"Bearer {create_access_token('user_1')}"}
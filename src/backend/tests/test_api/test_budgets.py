@@ -0,0 +1,56 @@
+"""
+Tests for budget period rollover.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, update
+
+from app.core.database import AsyncSessionLocal
+from app.models.budget import Budget
+from app.services.ledger import current_period_start, needs_rollover, period_spend
+
+CATEGORY = "Food & Dining"
+
+
+async def make_stale() -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(update(Budget).values(period_start=datetime(2020, 1, 1), spent=999.0))
+        await db.commit()
+
+
+async def spent_and_expected() -> tuple:
+    async with AsyncSessionLocal() as db:
+        budget = (await db.execute(select(Budget).where(Budget.category == CATEGORY))).scalars().first()
+        expected = await period_spend(db, budget.user_id, CATEGORY, current_period_start())
+        return round(budget.spent, 2), round(expected, 2)
+
+
+def test_needs_rollover_accepts_aware_period_starts():
+    period = current_period_start()
+    assert not needs_rollover(Budget(period_start=period.astimezone(timezone.utc)), period)
+    assert needs_rollover(Budget(period_start=(period - timedelta(days=1)).astimezone(timezone.utc)), period)
+    assert needs_rollover(Budget(period_start=None), period)
+
+
+def test_read_rollover_keeps_spend_already_in_the_period(run, client, auth_headers):
+    run(make_stale())
+    assert run(client.get("/api/v1/budgets/", headers=auth_headers)).status_code == 200
+    spent, expected = run(spent_and_expected())
+    assert spent == expected
+
+
+def test_write_rollover_counts_the_new_expense_once(run, client, auth_headers):
+    run(make_stale())
+    body = {"amount": 12.0, "category": CATEGORY, "description": "Lunch", "type": "expense"}
+    created = run(client.post("/api/v1/transactions/", headers=auth_headers, json=body))
+    assert created.status_code == 200
+    spent, expected = run(spent_and_expected())
+    assert spent == expected
+
+    run(make_stale())
+    transaction_id = created.json()["data"]["id"]
+    edited = run(client.put(f"/api/v1/transactions/{transaction_id}", headers=auth_headers, json={"amount": 30.0}))
+    assert edited.status_code == 200
+    spent, expected = run(spent_and_expected())
+    assert spent == expected
@@ -0,0 +1,60 @@
+"""
+Tests for the transaction endpoints of the SQL API.
+"""
+
+import asyncio
+import json
+
+from app.api.deps import invalidate_principal
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.user import User
+
+ITEM = {"amount": 2.5, "category": "Shopping", "description": "Test item", "type": "expense"}
+
+
+async def balance() -> float:
+    async with AsyncSessionLocal() as db:
+        return (await db.get(User, "user_1")).total_balance
+
+
+def test_concurrent_creates_on_cold_principal_cache(run, client, auth_headers):
+    # More concurrent creates than the file-SQLite pool holds connections
+    invalidate_principal("user_1")
+    count = settings.SQLITE_POOL_SIZE * 4
+    before = run(balance())
+
+    async def burst():
+        return await asyncio.gather(*[
+            client.post("/api/v1/transactions/", headers=auth_headers, json={**ITEM, "description": f"Burst {i}"})
+            for i in range(count)
+        ])
+
+    responses = run(burst())
+    assert [response.status_code for response in responses] == [200] * count
+    assert run(balance()) == before - count * ITEM["amount"]
+
+
+def test_batch_reports_invalid_items_individually(run, client, auth_headers):
+    body = [ITEM, {**ITEM, "amount": "not a number"}]
+    response = run(client.post("/api/v1/transactions/batch", headers=auth_headers, json=body))
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert (data["created"], data["failed"]) == (1, 1)
+    assert [result["success"] for result in data["results"]] == [True, False]
+
+
+def test_batch_rejects_malformed_bodies_with_422(run, client, auth_headers):
+    headers = {**auth_headers, "Content-Type": "application/json"}
+    oversized = json.dumps([ITEM] * (settings.TRANSACTION_BATCH_MAX_ITEMS + 1))
+    for body, error_type in (("{bad", "json_invalid"), ('{"a": 1}', "list_type"), (oversized, "too_long")):
+        response = run(client.post("/api/v1/transactions/batch", headers=headers, content=body))
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["type"] == error_type
+
+
+def test_batch_body_is_documented_as_transaction_list(run, client):
+    schema = run(client.get("/openapi.json")).json()
+    body = schema["paths"]["/api/v1/transactions/batch"]["post"]["requestBody"]["content"]["application/json"]["schema"]
+    assert body["items"] == {"$ref": "#/components/schemas/TransactionCreate"}
+    assert body["maxItems"] == settings.TRANSACTION_BATCH_MAX_ITEMS
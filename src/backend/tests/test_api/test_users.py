@@ -0,0 +1,15 @@
+"""
+Tests for the user endpoints of the SQL API.
+"""
+
+
+def test_user_endpoints_require_a_token(run, client):
+    for path in ("/api/v1/users/", "/api/v1/users/user_1", "/api/v1/users/me"):
+        assert run(client.get(path)).status_code == 401
+
+
+def test_users_only_see_themselves(run, client, auth_headers):
+    listing = run(client.get("/api/v1/users/", headers=auth_headers))
+    assert [user["id"] for user in listing.json()["data"]] == ["user_1"]
+    assert run(client.get("/api/v1/users/user_1", headers=auth_headers)).status_code == 200
+    assert run(client.get("/api/v1/users/user_2", headers=auth_headers)).status_code == 404
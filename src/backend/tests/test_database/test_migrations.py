@@ -0,0 +1,36 @@
+"""
+Tests for the schema migration runner.
+"""
+
+from sqlalchemy import create_engine, inspect, text
+
+from app.core.database import Base
+from app.db.migrations import MIGRATIONS, run_migrations
+
+
+def test_migrations_apply_once_in_order(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    Base.metadata.create_all(bind=engine)
+
+    assert run_migrations(engine) == sorted(migration.version for migration in MIGRATIONS)
+    assert run_migrations(engine) == []
+    with engine.connect() as connection:
+        recorded = [row[0] for row in connection.execute(text("SELECT version FROM schema_migrations ORDER BY version"))]
+    assert recorded == sorted(migration.version for migration in MIGRATIONS)
+
+
+def test_job_lease_columns_are_added_to_existing_tables(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'upgrade.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        # A jobs table as created before leases existed
+        connection.execute(text("DROP TABLE jobs"))
+        connection.execute(text(
+            "CREATE TABLE jobs (id VARCHAR PRIMARY KEY, kind VARCHAR, status VARCHAR, payload JSON, "
+            "result JSON, error TEXT, user_id VARCHAR, created_at DATETIME, started_at DATETIME, "
+            "finished_at DATETIME)"
+        ))
+
+    run_migrations(engine)
+    columns = {column["name"] for column in inspect(engine).get_columns("jobs")}
+    assert {"owner", "heartbeat_at"} <= columns
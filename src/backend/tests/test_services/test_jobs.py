@@ -0,0 +1,67 @@
+"""
+Tests for background job leases.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+from app.core.database import AsyncSessionLocal
+from app.models.job import Job
+from app.services.jobs import JobQueue
+
+
+async def sleeper(db, job):
+    await asyncio.sleep(float(job.payload.get("seconds", 0)))
+    return {"ok": True}
+
+
+def queue(lease: float) -> JobQueue:
+    jobs = JobQueue(lease=lease)
+    jobs.register("sleep", sleeper)
+    return jobs
+
+
+async def add_running(job_id: str, owner: str, heartbeat_at: datetime) -> None:
+    async with AsyncSessionLocal() as db:
+        db.add(Job(id=job_id, kind="sleep", status="running", payload={}, user_id="user_1", owner=owner, heartbeat_at=heartbeat_at))
+        await db.commit()
+
+
+async def load(job_id: str) -> Job:
+    async with AsyncSessionLocal() as db:
+        return await db.get(Job, job_id)
+
+
+def test_start_reclaims_only_expired_leases(run, database):
+    async def scenario():
+        await add_running("job_lease_live", "other-worker", datetime.utcnow())
+        await add_running("job_lease_expired", "gone-worker", datetime.utcnow() - timedelta(minutes=10))
+        jobs = queue(lease=60)
+        await jobs.start()
+        await asyncio.sleep(0.3)
+        await jobs.close()
+        return await load("job_lease_live"), await load("job_lease_expired"), jobs.owner
+
+    live, expired, owner = run(scenario())
+    assert (live.status, live.owner) == ("running", "other-worker")
+    assert (expired.status, expired.owner) == ("succeeded", owner)
+
+
+def test_heartbeat_keeps_a_long_job_leased(run, database):
+    async def scenario():
+        first = queue(lease=0.3)
+        await first.start()
+        async with AsyncSessionLocal() as db:
+            job = await first.submit(db, "user_1", "sleep", {"seconds": 1.0})
+        await asyncio.sleep(0.5)
+        # A second queue starting mid-run must not take the job over
+        second = queue(lease=0.3)
+        await second.start()
+        await asyncio.sleep(1.0)
+        await first.close()
+        await second.close()
+        return await load(job.id), first.owner
+
+    job, owner = run(scenario())
+    assert job.status == "succeeded"
+    assert job.owner == owner
@@ -0,0 +1,45 @@
+"""
+Tests for the CSV and OFX statement parsers of the standalone API.
+"""
+
+import io
+
+import pytest
+
+from main import import_payload, import_type, parse_csv_statement, parse_ofx_statement
+
+OFX = b"""OFXHEADER:100
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20250105120000<TRNAMT>-42.10<NAME>Whole Foods<MEMO>Groceries run
+</STMTTRN>
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20250107<TRNAMT>1500.00<NAME>Acme Payroll</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+
+def test_csv_columns_are_matched_by_alias():
+    data = b"\xef\xbb\xbfPosted Date,Payee,Withdrawal,Deposit\n01/05/2025,Corner Deli,12.50,\n\n2025-01-06,Acme,,300\n"
+    rows = list(parse_csv_statement(io.BytesIO(data)))
+    assert rows == [
+        (2, {"date": "01/05/2025", "merchant": "Corner Deli", "debit": "12.50"}),
+        (4, {"date": "2025-01-06", "merchant": "Acme", "credit": "300"}),
+    ]
+    assert import_payload(rows[0][1], "Checking").type.value == "expense"
+    assert import_payload(rows[1][1], "Checking").type.value == "income"
+
+
+@pytest.mark.parametrize("chunk_size", [7, 65536])
+def test_ofx_transactions_parse_across_chunk_boundaries(chunk_size):
+    rows = list(parse_ofx_statement(io.BytesIO(OFX), chunk_size=chunk_size))
+    assert [number for number, _ in rows] == [1, 2]
+    first, second = rows[0][1], rows[1][1]
+    assert first == {"merchant": "Whole Foods", "date": "20250105", "amount": "-42.10", "note": "Groceries run"}
+    assert second["type"] == "CREDIT"
+    assert import_payload(first, "Checking").amount == 42.10
+
+
+def test_unknown_import_types_follow_the_amount_sign():
+    assert import_type("Debit Card", 5.0) == "expense"
+    assert import_type("Refund", -5.0) == "income"
+    assert import_type("Mystery", -5.0) == "expense"
+    assert import_type("Payment", 5.0) == "income"
@@ -0,0 +1,132 @@
+"""
+Tests for the in-memory transaction store of the standalone API.
+"""
+
+import threading
+from datetime import date, timedelta
+
+import main
+from main import Transaction, TransactionStore
+
+
+def row(day: int, merchant: str = "Corner Shop", amount: float = 10.0) -> Transaction:
+    return Transaction(date=date(2025, 1, 1) + timedelta(days=day), merchant=merchant, category="Other", amount=amount, type="expense")
+
+
+def test_rows_walk_newest_first_from_a_key():
+    store = TransactionStore([row(day) for day in (5, 1, 9, 3)])
+    ordered = list(store.newest_first())
+    assert [item.date.day for item in ordered] == [10, 6, 4, 2]
+    key = main.transaction_key(ordered[1])
+    assert list(store.older_than(key)) == ordered[2:]
+
+
+def test_compaction_keeps_index_and_order():
+    items = [row(day % 300, f"Shop {day}") for day in range(3000)]
+    store = TransactionStore()
+    store.extend(items)
+    for item in items[::2] + items[1::4]:
+        store.remove(item.id)
+    kept = items[3::4]
+
+    assert store._tombstones < len(items) // 2
+    assert len(store) == len(kept)
+    assert all(store.get(item.id) is item for item in kept)
+    assert sorted(item.id for item in store.newest_first()) == sorted(item.id for item in kept)
+
+
+def test_update_moves_a_row_to_its_new_date():
+    item = row(1)
+    store = TransactionStore([item, row(5)])
+    updated = store.update(item.id, {"date": date(2025, 3, 1)})
+    assert next(store.newest_first()) is updated
+    assert store.update("missing", {"amount": 1.0}) is None
+
+
+def test_paged_search_matches_full_search():
+    store = TransactionStore([row(day, "Coffee Bar" if day % 3 else "Book Shop") for day in range(200)])
+    full = store.search("coffee")
+    key, paged = None, []
+    while True:
+        page = list(main.islice(store.search_older_than("coffee", key), 25))
+        if not page:
+            break
+        paged += page
+        key = main.transaction_key(page[-1])
+    assert paged == full
+
+
+def test_encoded_cache_is_bounded():
+    store = TransactionStore([row(day % 300, f"Shop {day}") for day in range(main.ENCODED_CACHE_SIZE + 100)])
+    for item in store.newest_first():
+        store.encoded(item)
+    assert len(store._encoded) == 0
+    for item in store.newest_first():
+        assert store.encoded(item, cache=True) == main.encode_model(item)
+    assert len(store._encoded) == main.ENCODED_CACHE_SIZE
+
+
+def test_reads_survive_concurrent_compaction():
+    store = TransactionStore()
+    errors = []
+    done = threading.Event()
+
+    def read():
+        while not done.is_set():
+            try:
+                list(store.newest_first())
+                store.since(date(2025, 6, 1))
+            except Exception as exc:
+                errors.append(exc)
+
+    readers = [threading.Thread(target=read) for _ in range(2)]
+    for reader in readers:
+        reader.start()
+    try:
+        # Each round leaves enough tombstones to trigger a compaction
+        for _ in range(3):
+            items = [row(day % 400, f"Shop {day}") for day in range(1500)]
+            store.extend(items)
+            for item in items:
+                store.remove(item.id)
+    finally:
+        done.set()
+        for reader in readers:
+            reader.join()
+    assert errors == []
+
+
+def test_update_never_revives_a_concurrently_deleted_row():
+    store = TransactionStore()
+    for _ in range(200):
+        item = row(1)
+        store.add(item)
+        barrier = threading.Barrier(2)
+
+        def update():
+            barrier.wait()
+            store.update(item.id, {"amount": 2.0})
+
+        def delete():
+            barrier.wait()
+            store.remove(item.id)
+
+        threads = [threading.Thread(target=update), threading.Thread(target=delete)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert store.get(item.id) is None
+
+
+def test_monthly_trend_covers_six_consecutive_months():
+    months = [entry["month"] for entry in main.build_monthly_trend()]
+    expected = [main.month_key(main.add_months(main.CURRENT_MONTH_START, -offset)) for offset in range(5, -1, -1)]
+    assert months == expected
+
+
+def test_rule_matcher_normalizes_merchants_and_patterns():
+    rules = [main.CategoryRule(pattern="Corner   Deli", category="Dining"), main.CategoryRule(pattern="   ", category="Blank")]
+    matcher = main.RuleMatcher(rules)
+    assert matcher.match("THE corner deli  #2").category == "Dining"
+    assert matcher.match("Bakery") is None